@@ -0,0 +1,86 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import List
+import lxml.html
+from crawl4ai.markdown_generation_strategy import MarkdownGenerationStrategy
+from crawl4ai.models import MarkdownGenerationResult
+
+_CONN_RE = re.compile(r'(\d+)\+?\s*connections', re.IGNORECASE)
+
+@dataclass(slots=True)
+class LinkedInProfile:
+    name: str
+    designation: str
+    url: str
+    description: str = ""
+    connections: str = "Not specified"
+    company: str = "Not specified"
+
+class NoMarkdownGenerator(MarkdownGenerationStrategy):
+    """crawl4ai markdown strategy that skips the HTML-to-markdown pass entirely.
+
+    Used for crawls that only read result.html or result.metadata, where the markdown
+    crawl4ai builds for every page by default would only be thrown away.
+    """
+
+    def generate_markdown(self, cleaned_html, *args, **kwargs):
+        return MarkdownGenerationResult(raw_markdown="", markdown_with_citations="", references_markdown="")
+
+def build_profile(url: str, title: str, description: str) -> LinkedInProfile:
+    """Build a profile from a search result's title, link and snippet."""
+    # Extract name and designation
+    title_parts = title.split(' - ')
+    name = title_parts[0].strip('*')
+    designation = 'HR Professional'  # Default
+    company = "Not specified"
+
+    if len(title_parts) > 1:
+        designation = title_parts[1].strip('*')
+        # Try to extract company
+        if ' at ' in designation.lower():
+            company = designation.split(' at ')[-1].strip()
+        elif ' @ ' in designation:
+            company = designation.split(' @ ')[-1].strip()
+
+    # Extract connections if available
+    conn_match = _CONN_RE.search(description)
+    connections = f"{conn_match.group(1)}+" if conn_match else "Not specified"
+
+    logging.debug(f"Extracted profile: {name} - {company}")
+    return LinkedInProfile(
+        name=name,
+        designation=designation,
+        url=url,
+        description=description,
+        connections=connections,
+        company=company
+    )
+
+def extract_profiles_from_html(html: str) -> List[LinkedInProfile]:
+    """Extract LinkedIn profiles straight from a Bing results page."""
+    profiles = []
+    logging.debug(f"Processing HTML content length: {len(html)}")
+
+    try:
+        tree = lxml.html.fromstring(html)
+        for result in tree.cssselect('li.b_algo'):
+            links = result.cssselect('h2 a')
+            if not links:
+                continue
+
+            url = links[0].get('href', '')
+            if 'linkedin.com/in/' not in url:
+                continue
+            logging.debug(f"Found LinkedIn URL: {url}")
+
+            captions = result.cssselect('.b_caption p')
+            description = captions[0].text_content().strip() if captions else ""
+
+            profiles.append(build_profile(url, links[0].text_content().strip(), description))
+
+    except Exception as e:
+        logging.error(f"Error extracting profiles: {str(e)}", exc_info=True)
+
+    logging.info(f"Total profiles extracted: {len(profiles)}")
+    return profiles
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from playwright.async_api import async_playwright
+
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-background-networking",
+    "--disable-features=IsolateOrigins,site-per-process"
+]
+
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/121.0.0.0 Safari/537.36'
+}
+
+# Resource types the scrapers never read; img.src is still available without the bytes
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+
+async def block_heavy_resources(target):
+    """Abort image/media/font/stylesheet requests for a page, or every page in a context."""
+    await target.route(
+        '**/*',
+        lambda route: route.abort() if route.request.resource_type in BLOCKED_RESOURCE_TYPES else route.continue_()
+    )
+
+async def block_heavy_resources_hook(page, context, **kwargs):
+    """crawl4ai on_page_context_created hook that blocks heavy resources on the new page.
+    
+    The managed browser reuses one context for every page, so routing the context here
+    would stack another handler on it for each page the crawler opens.
+    """
+    await block_heavy_resources(page)
+    return page
+
+@dataclass
+class BrowserInstance:
+    browser: object
+    created_at: float = field(default_factory=time.monotonic)
+    pages_served: int = 0
+    active: int = 0
+
+class BrowserPool:
+    """Keeps Chromium running between scrape calls and hands out long-lived shared contexts from it."""
+
+    def __init__(self, headless=True, max_age_seconds=1800, max_pages_per_browser=100, block_resources=True):
+        self.headless = headless
+        self.block_resources = block_resources
+        self.max_age_seconds = max_age_seconds
+        self.max_pages_per_browser = max_pages_per_browser
+        self._playwright = None
+        self._lock = asyncio.Lock()
+        # The last instance serves new contexts, older ones are retired once drained
+        self._instances: list[BrowserInstance] = []
+        self._owners = {}
+        # One long-lived context per login session, keyed by (user, user_data_dir) so a
+        # persistent profile and an in-memory context for the same user never collide;
+        # its pages share cookies and connections
+        self._shared_contexts = {}
+        # Scrapes currently inside shared_context() for each context, so a retired
+        # context is only closed once the last of them is done with it
+        self._context_users = {}
+        # Contexts that closed underneath us (Chromium crashed or someone closed them)
+        self._closed_contexts = set()
+        self._context_lock = asyncio.Lock()
+
+    async def start(self):
+        """Start Playwright and launch the first browser."""
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+            await self._create_instance()
+            logging.info(f"Browser pool started (headless={self.headless})")
+
+    async def _create_instance(self):
+        # New-mode headless runs the full browser without a window or compositor
+        args = LAUNCH_ARGS + (["--headless=new"] if self.headless else [])
+        browser = await self._playwright.chromium.launch(headless=self.headless, args=args)
+        instance = BrowserInstance(browser)
+        self._instances.append(instance)
+        return instance
+
+    def _is_stale(self, instance):
+        return (
+            not instance.browser.is_connected()
+            or time.monotonic() - instance.created_at > self.max_age_seconds
+            or instance.pages_served >= self.max_pages_per_browser
+        )
+
+    async def _reap(self):
+        """Close retired browsers that no longer have contexts checked out."""
+        current = self._instances[-1] if self._instances else None
+        for instance in list(self._instances):
+            if instance is not current and instance.active == 0:
+                self._instances.remove(instance)
+                try:
+                    await instance.browser.close()
+                except Exception as e:
+                    logging.warning(f"Error closing retired browser: {str(e)}")
+
+    async def _get_instance(self):
+        async with self._lock:
+            if self._playwright is None:
+                await self.start()
+            instance = self._instances[-1] if self._instances else None
+            if instance is None or self._is_stale(instance):
+                # Crashed, too old or overused: launch a replacement and drain the old one
+                logging.info("Recycling pooled browser")
+                instance = await self._create_instance()
+                await self._reap()
+            instance.active += 1
+            return instance
+
+    @asynccontextmanager
+    async def shared_context(self, user='default', user_data_dir=None, **context_options):
+        """Yield the shared context for a login session, creating it on first use.
+        
+        The context stays open on exit so later scrapes for the same user open pages
+        on it and reuse its live connections to LinkedIn. Once the context closes, its
+        browser crashes, outlives max_age_seconds or has opened max_pages_per_browser
+        pages, the next call gets a fresh context and the old one is released after
+        its remaining users exit. With user_data_dir the context is a persistent
+        Chromium profile on disk, so cookies and caches also survive between runs.
+        """
+        key = (user, user_data_dir)
+        async with self._context_lock:
+            context = self._shared_contexts.get(key)
+            if context in self._closed_contexts or (
+                context in self._owners and self._is_stale(self._owners[context])
+            ):
+                # Stop handing out the old context; close it now if nobody is using it
+                logging.info("Recycling shared browser context")
+                del self._shared_contexts[key]
+                if not self._context_users.get(context):
+                    await self.release(context)
+                context = None
+            if user_data_dir is not None:
+                if context is None:
+                    if self._playwright is None:
+                        self._playwright = await async_playwright().start()
+                    context = await self._playwright.chromium.launch_persistent_context(
+                        user_data_dir,
+                        headless=self.headless,
+                        args=LAUNCH_ARGS + (["--headless=new"] if self.headless else []),
+                        **{**CONTEXT_OPTIONS, **context_options}
+                    )
+                    await self._prepare_context(context)
+                    self._shared_contexts[key] = context
+            elif context is None:
+                instance = await self._get_instance()
+                try:
+                    context = await instance.browser.new_context(**{**CONTEXT_OPTIONS, **context_options})
+                    await self._prepare_context(context)
+                except Exception:
+                    instance.active -= 1
+                    raise
+                # Count every page opened on the context against its browser's page budget
+                context.on("page", lambda page: setattr(instance, 'pages_served', instance.pages_served + 1))
+                self._owners[context] = instance
+                self._shared_contexts[key] = context
+            self._context_users[context] = self._context_users.get(context, 0) + 1
+        try:
+            yield context
+        finally:
+            # Skip the bookkeeping if shutdown() already released the context
+            if context in self._context_users:
+                self._context_users[context] -= 1
+                if not self._context_users[context] and context not in self._shared_contexts.values():
+                    # Retired while this scrape was still using it
+                    await self.release(context)
+
+    async def _prepare_context(self, context):
+        context.on("close", lambda ctx: self._closed_contexts.add(ctx))
+        context.set_default_navigation_timeout(15000)
+        if self.block_resources:
+            await block_heavy_resources(context)
+
+    async def release(self, context):
+        """Close a shared context and drain its browser if it was retired."""
+        self._context_users.pop(context, None)
+        self._closed_contexts.discard(context)
+        instance = self._owners.pop(context, None)
+        try:
+            await context.close()
+        except Exception as e:
+            logging.warning(f"Error closing browser context: {str(e)}")
+        if instance is not None:
+            instance.active -= 1
+            async with self._lock:
+                await self._reap()
+
+    async def shutdown(self):
+        """Close every browser and stop Playwright."""
+        # Include retired contexts that are still waiting for their last user
+        for context in {*self._shared_contexts.values(), *self._owners}:
+            await self.release(context)
+        self._shared_contexts.clear()
+        for instance in self._instances:
+            try:
+                await instance.browser.close()
+            except Exception as e:
+                logging.warning(f"Error closing browser: {str(e)}")
+        self._instances.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        logging.info("Browser pool shut down")
@@ -1,7 +1,12 @@
 import asyncio
+import json
 import logging
+import os
+import aiohttp
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+from browser_pool import block_heavy_resources_hook
+from bing_results import NoMarkdownGenerator
 
 # Configure logging
 logging.basicConfig(
@@ -13,13 +18,52 @@ logging.basicConfig(
     ]
 )
 
+# Returns the signed-in member as JSON, or 401 when the session cookies are stale
+VOYAGER_ME_URL = 'https://www.linkedin.com/voyager/api/me'
+
+async def probe_session_api(crawler):
+    """Check the browser's LinkedIn cookies against the API without rendering a page.
+    
+    Returns False only on a 401; any status other than 200 or 401 raises so the caller
+    can fall back to the feed page.
+    """
+    context = crawler.crawler_strategy.browser_manager.default_context
+    cookies = {c['name']: c['value'] for c in await context.cookies('https://www.linkedin.com')}
+    
+    # Voyager expects the JSESSIONID value echoed back as the CSRF token; send the
+    # browser's user agent so the request isn't flagged as a bot (999/403)
+    headers = {
+        'csrf-token': cookies.get('JSESSIONID', '').strip('"'),
+        'user-agent': crawler.browser_config.user_agent
+    }
+    async with aiohttp.ClientSession(cookies=cookies, headers=headers) as session:
+        async with session.get(VOYAGER_ME_URL, allow_redirects=False, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            # Only a 401 says the session is gone; anything else is inconclusive
+            if resp.status == 401:
+                return False
+            if resp.status != 200:
+                raise RuntimeError(f"unexpected status {resp.status}")
+            return True
+
 async def check_login_status(crawler):
-    """Check if we're logged in by visiting LinkedIn."""
+    """Check if we're logged in, asking the API first and visiting LinkedIn only if that fails."""
+    try:
+        is_logged_in = await probe_session_api(crawler)
+        if is_logged_in:
+            logging.info("Already logged in")
+        else:
+            logging.info("Not logged in")
+        return is_logged_in
+    except Exception as e:
+        logging.warning(f"Session API probe failed, falling back to the feed page: {str(e)}")
+    
     try:
         result = await crawler.arun(
             url='https://www.linkedin.com/feed/',
             config=CrawlerRunConfig(
-                markdown_generator=DefaultMarkdownGenerator(),
+                # Only the metadata is read here, so skip markdown and the analytics network-idle wait
+                markdown_generator=NoMarkdownGenerator(),
+                wait_until='domcontentloaded',
                 js_code='''
                 // Wait for either feed content or login form
                 try {
@@ -54,14 +98,22 @@ async def check_login_status(crawler):
 
 async def perform_login(crawler):
     """Handle the login process."""
+    username = os.environ.get('LI_USER')
+    password = os.environ.get('LI_PASS')
+    if not username or not password:
+        logging.error("LI_USER and LI_PASS must be set to log in")
+        return False
+    
     try:
         logging.info("Attempting login...")
         
         result = await crawler.arun(
             url='https://www.linkedin.com/login',
             config=CrawlerRunConfig(
-                markdown_generator=DefaultMarkdownGenerator(),
-                js_code='''
+                # Only the metadata is read here, so skip markdown
+                markdown_generator=NoMarkdownGenerator(),
+                wait_until='domcontentloaded',
+                js_code=f"const LI_USER = {json.dumps(username)}, LI_PASS = {json.dumps(password)};\n" + '''
                 try {
                     // Wait for form elements with longer timeout
                     await page.waitForSelector('input[name="session_key"]', { timeout: 10000 });
@@ -74,8 +126,8 @@ async def perform_login(crawler):
                     });
                     
                     // Type credentials with delay
-                    await page.type('input[name="session_key"]', 'anujpatil917@gmail.com', { delay: 100 });
-                    await page.type('input[name="session_password"]', 'Anuj@789@anuj', { delay: 100 });
+                    await page.type('input[name="session_key"]', LI_USER, { delay: 100 });
+                    await page.type('input[name="session_password"]', LI_PASS, { delay: 100 });
                     
                     // Click sign in button
                     await page.click('button[type="submit"]');
@@ -113,7 +165,7 @@ async def perform_login(crawler):
             error_msg = result.metadata.get('error', 'Unknown error')
             logging.error(f"Login failed: {error_msg}")
             return False
-        
+    
     except Exception as e:
         logging.error(f"Error during login: {str(e)}")
         return False
@@ -128,9 +180,10 @@ async def main():
         verbose=True,
         use_managed_browser=True,
         browser_type="chromium",
-        user_data_dir="C:/Users/91798/chrome_crawler_profile"
+        user_data_dir="C:/Users/91798/chrome_crawler_profile",
+        extra_args=["--blink-settings=imagesEnabled=false"]
     )
-    logging.debug(f"Browser config created: {browser_config}")
+    logging.debug("Browser config created: %r", browser_config)
 
     # 2) Create default run config
     logging.debug("Creating default run configuration...")
@@ -139,26 +192,41 @@ async def main():
         wait_until='networkidle',
         page_timeout=30000
     )
-    logging.debug(f"Default run config created: {default_run_config}")
+    logging.debug("Default run config created: %r", default_run_config)
 
     # 3) Create search-specific config
     logging.debug("Creating search-specific configuration...")
     search_config = CrawlerRunConfig(
         markdown_generator=DefaultMarkdownGenerator(),
+        # LinkedIn never goes network-idle, so rely on the results selector for readiness
+        wait_until='domcontentloaded',
         wait_for=".search-results-container",
         js_code='''
         // Wait for results to load
         await page.waitForSelector('.search-results-container', { timeout: 10000 });
         
-        // Scroll to load more results
-        let prevHeight = 0;
-        let newHeight = await page.evaluate(() => document.body.scrollHeight);
-        
-        while (prevHeight !== newHeight) {
-            prevHeight = newHeight;
-            await page.evaluate(() => window.scrollTo(0, document.body.scrollHeight));
-            await page.waitForTimeout(2000);
-            newHeight = await page.evaluate(() => document.body.scrollHeight);
+        // Scroll to load more results, waiting only until new cards appear
+        const MAX_PAGES = 5;
+        const RESULT_SELECTOR = '.reusable-search__result-container';
+        const countResults = () => document.querySelectorAll(RESULT_SELECTOR).length;
+        // Resolves as soon as more than `before` cards are rendered, or after 4s
+        const waitForMore = (before) => new Promise(resolve => {
+            const done = () => {
+                clearTimeout(timer);
+                observer.disconnect();
+                resolve();
+            };
+            const observer = new MutationObserver(() => {
+                if (countResults() > before) done();
+            });
+            const timer = setTimeout(done, 4000);
+            observer.observe(document.body, { childList: true, subtree: true });
+        });
+        for (let i = 0; i < MAX_PAGES; i++) {
+            const before = countResults();
+            window.scrollTo(0, document.body.scrollHeight);
+            await waitForMore(before);
+            if (countResults() === before) break;
         }
         
         // Extract profile information
@@ -187,7 +255,7 @@ async def main():
         return profiles;
         '''
     )
-    logging.debug(f"Search config created: {search_config}")
+    logging.debug("Search config created: %r", search_config)
 
     logging.info("Initializing crawler...")
     try:
@@ -196,6 +264,7 @@ async def main():
             browser_config=browser_config,
             default_run_config=default_run_config
         )
+        crawler.crawler_strategy.set_hook('on_page_context_created', block_heavy_resources_hook)
         await crawler.start()
         logging.info("Crawler initialized successfully")
 
@@ -214,13 +283,13 @@ async def main():
                 config=search_config
             )
             
-            logging.debug(f"Crawler result: success={result.success}")
+            logging.debug("Crawler result: success=%s", result.success)
             if result.success:
                 logging.info("Successfully accessed search results!")
                 logging.debug("Response metadata:")
-                logging.debug(f"URL: {result.url}")
-                logging.debug(f"HTML length: {len(result.html) if result.html else 0}")
-                logging.debug(f"Markdown length: {len(result.markdown) if result.markdown else 0}")
+                logging.debug("URL: %s", result.url)
+                logging.debug("HTML length: %d", len(result.html) if result.html else 0)
+                logging.debug("Markdown length: %d", len(result.markdown) if result.markdown else 0)
                 
                 if result.metadata and 'profiles' in result.metadata:
                     profiles = result.metadata['profiles']
@@ -237,7 +306,7 @@ async def main():
             else:
                 logging.error(f"Error: {result.error_message}")
                 if hasattr(result, 'metadata'):
-                    logging.debug(f"Result metadata: {result.metadata}")
+                    logging.debug("Result metadata: %r", result.metadata)
         finally:
             await crawler.close()
             
@@ -5,9 +5,27 @@ from pathlib import Path
 import json
 import logging
 from datetime import datetime
+from scraper_utils import write_json_atomic
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Parsed cookies keyed by path, stored as (mtime, cookies)
+_COOKIE_CACHE = {}
+
+def load_cookies(path):
+    """Load cookies from disk, reusing the parsed list while the file is unchanged."""
+    mtime = os.stat(path).st_mtime
+    cached = _COOKIE_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, 'r') as f:
+        cookies = json.load(f)
+    # Keep only the last cookie per (name, domain, path) so add_cookies ships no duplicates
+    cookies = list({(c['name'], c.get('domain'), c.get('path')): c for c in cookies}.values())
+    _COOKIE_CACHE[path] = (mtime, cookies)
+    return cookies
+
 async def debug_scrape():
     # Setup directories
     user_data_dir = os.path.join(str(Path.home()), ".linkedin_automation")
@@ -30,13 +48,18 @@ async def debug_scrape():
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/121.0.0.0 Safari/537.36'
         )
         
+        # Skip images/fonts/media; stylesheets stay so the debug screenshots are readable
+        await context.route(
+            '**/*',
+            lambda route: route.abort() if route.request.resource_type in {'image', 'font', 'media'} else route.continue_()
+        )
+        
         page = await context.new_page()
         
         # Try to load existing cookies first
         if os.path.exists(cookies_file):
             logging.info("Found existing cookies, attempting to use them...")
-            with open(cookies_file, 'r') as f:
-                cookies = json.load(f)
+            cookies = load_cookies(cookies_file)
             await context.add_cookies(cookies)
             
             # Try to access feed directly
@@ -87,24 +110,28 @@ async def debug_scrape():
             '.search-results__list'
         ]
         
-        for selector in selectors_to_check:
-            try:
-                elements = await page.query_selector_all(selector)
-                logging.info(f"Selector '{selector}': found {len(elements)} elements")
-                
-                if elements:
-                    first_elem = elements[0]
-                    # Try to extract profile info from first element
-                    try:
-                        name_elem = await first_elem.query_selector('.entity-result__title-text a')
-                        if name_elem:
-                            name = await name_elem.inner_text()
-                            url = await name_elem.get_attribute('href')
-                            logging.info(f"First result - Name: {name}, URL: {url}")
-                    except Exception as e:
-                        logging.error(f"Error extracting info from element: {str(e)}")
-            except Exception as e:
-                logging.error(f"Error checking selector {selector}: {str(e)}")
+        # Probe every selector in one browser-side pass instead of a round-trip each
+        probes = await page.evaluate('''(selectors) => Object.fromEntries(selectors.map(selector => {
+            try {
+                const elements = document.querySelectorAll(selector);
+                const nameElem = elements.length ? elements[0].querySelector('.entity-result__title-text a') : null;
+                return [selector, {
+                    count: elements.length,
+                    name: nameElem ? nameElem.innerText : null,
+                    url: nameElem ? nameElem.getAttribute('href') : null
+                }];
+            } catch (e) {
+                return [selector, { error: e.message }];
+            }
+        }))''', selectors_to_check)
+        
+        for selector, probe in probes.items():
+            if 'error' in probe:
+                logging.error(f"Error checking selector {selector}: {probe['error']}")
+                continue
+            logging.info(f"Selector '{selector}': found {probe['count']} elements")
+            if probe['name'] is not None:
+                logging.info(f"First result - Name: {probe['name']}, URL: {probe['url']}")
         
         # Check for profile links
         profile_links = await page.query_selector_all('a[href*="/in/"]')
@@ -126,12 +153,18 @@ async def debug_scrape():
 
 async def perform_manual_login(page, user_data_dir, cookies_file):
     """Handle manual login process and save cookies."""
+    username = os.environ.get('LI_USER')
+    password = os.environ.get('LI_PASS')
+    if not username or not password:
+        logging.error("LI_USER and LI_PASS must be set to log in")
+        return
+    
     await page.goto('https://www.linkedin.com/login')
     await page.wait_for_load_state('networkidle')
     
     # Fill login form
-    await page.fill('#username', 'anujpatil917@gmail.com')
-    await page.fill('#password', 'Anuj@789@anuj')
+    await page.fill('#username', username)
+    await page.fill('#password', password)
     
     # Click login button
     await page.click('button[type="submit"]')
@@ -145,8 +178,7 @@ async def perform_manual_login(page, user_data_dir, cookies_file):
         # Save cookies for future use
         cookies = await page.context.cookies()
         os.makedirs(user_data_dir, exist_ok=True)
-        with open(cookies_file, 'w') as f:
-            json.dump(cookies, f)
+        write_json_atomic(cookies_file, cookies)
         logging.info("Saved cookies for future use")
     except Exception as e:
         logging.error(f"Error during login: {str(e)}")
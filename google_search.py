@@ -1,13 +1,14 @@
 import asyncio
 from crawl4ai import *
-import re
-from dataclasses import dataclass
 from typing import List
 import psutil
 import csv
 from datetime import datetime
 import os
 import logging
+import aiohttp
+from browser_pool import block_heavy_resources_hook
+from bing_results import LinkedInProfile, NoMarkdownGenerator, extract_profiles_from_html
 
 # Configure logging
 logging.basicConfig(
@@ -19,17 +20,14 @@ logging.basicConfig(
     ]
 )
 
-@dataclass
-class LinkedInProfile:
-    name: str
-    designation: str
-    url: str
-    description: str = ""
-    connections: str = "Not specified"
-    company: str = "Not specified"
-
-def save_profiles_to_csv(profiles: List[LinkedInProfile], search_query: str):
-    """Save profiles to a CSV file with timestamp."""
+STATIC_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/121.0.0.0 Safari/537.36'
+}
+
+CSV_HEADER = ['Name', 'Designation', 'Company', 'Connections', 'LinkedIn URL', 'Description', 'Search Query']
+
+def open_profiles_csv():
+    """Create a timestamped CSV file, write the header and return (file, writer)."""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"linkedin_profiles_{timestamp}.csv"
     
@@ -39,97 +37,50 @@ def save_profiles_to_csv(profiles: List[LinkedInProfile], search_query: str):
     
     print(f"\nSaving profiles to: {filepath}")
     
-    with open(filepath, 'w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        # Write header
-        writer.writerow(['Name', 'Designation', 'Company', 'Connections', 'LinkedIn URL', 'Description', 'Search Query'])
-        
-        # Write profile data
-        for profile in profiles:
-            # Extract company from designation if possible
-            company = profile.company
-            if 'at ' in profile.designation.lower():
-                company = profile.designation.lower().split('at ')[-1].strip().title()
-            
-            writer.writerow([
-                profile.name,
-                profile.designation,
-                company,
-                profile.connections,
-                profile.url,
-                profile.description.replace('\n', ' '),
-                search_query
-            ])
-    
-    print(f"Saved {len(profiles)} profiles to CSV file")
+    file = open(filepath, 'w', newline='', encoding='utf-8')
+    writer = csv.writer(file)
+    writer.writerow(CSV_HEADER)
+    return file, writer
 
-def extract_linkedin_profiles(markdown_content: str, search_query: str) -> List[LinkedInProfile]:
-    profiles = []
-    logging.debug(f"Processing markdown content length: {len(markdown_content)}")
-    
-    try:
-        # Pattern to match LinkedIn profile sections
-        profile_pattern = r'\[([^\]]+)\]\(https://www\.bing\.com/<(https:/[^>]+)>\)\n## \[([^\]]+)\]'
-        matches = re.finditer(profile_pattern, markdown_content)
-        
-        for match in matches:
-            if 'linkedin.com/in/' not in match.group(2):
-                continue
-                
-            # Clean up the URL (remove bing redirect)
-            url = match.group(2).replace('https://', 'https://')
-            logging.debug(f"Found LinkedIn URL: {url}")
-            
-            # Extract name and designation
-            title_parts = match.group(3).split(' - ')
-            name = title_parts[0].strip('*')
-            designation = 'HR Professional'  # Default
-            company = "Not specified"
-            
-            if len(title_parts) > 1:
-                designation = title_parts[1].strip('*')
-                # Try to extract company
-                if ' at ' in designation.lower():
-                    company = designation.split(' at ')[-1].strip()
-                elif ' @ ' in designation:
-                    company = designation.split(' @ ')[-1].strip()
-            
-            # Find description in the following lines
-            description = ""
-            desc_start = markdown_content.find(match.group(0)) + len(match.group(0))
-            next_section = markdown_content.find('[', desc_start)
-            if next_section != -1:
-                description = markdown_content[desc_start:next_section].strip()
-            
-            # Extract connections if available
-            connections = "Not specified"
-            if "connections" in description.lower():
-                conn_match = re.search(r'(\d+)\+?\s*connections', description, re.IGNORECASE)
-                if conn_match:
-                    connections = f"{conn_match.group(1)}+"
-            
-            profile = LinkedInProfile(
-                name=name,
-                designation=designation,
-                url=url,
-                description=description,
-                connections=connections,
-                company=company
-            )
-            
-            logging.debug(f"Extracted profile: {name} - {company}")
-            profiles.append(profile)
-            
-    except Exception as e:
-        logging.error(f"Error extracting profiles: {str(e)}", exc_info=True)
+def profile_row(profile: LinkedInProfile, search_query: str):
+    """Build the CSV row for a single profile."""
+    designation = profile.designation
+    company = profile.company
+    # Extract company from designation if possible
+    lowered = designation.lower()
+    if 'at ' in lowered:
+        company = lowered.split('at ')[-1].strip().title()
     
-    logging.info(f"Total profiles extracted: {len(profiles)}")
-    return profiles
+    return (
+        profile.name,
+        designation,
+        company,
+        profile.connections,
+        profile.url,
+        profile.description.replace('\n', ' '),
+        search_query
+    )
+
+def append_profiles(writer, profiles: List[LinkedInProfile], search_query: str):
+    """Write profile rows to an already opened CSV writer."""
+    writer.writerows(profile_row(profile, search_query) for profile in profiles)
+
+def is_static_url(url: str) -> bool:
+    """Bing result pages are plain HTML and don't need a browser to render."""
+    return 'bing.com/search' in url
+
+async def fetch_static(session: aiohttp.ClientSession, url: str) -> str:
+    """Fetch a page's raw HTML without going through the browser."""
+    async with session.get(url) as response:
+        response.raise_for_status()
+        return await response.text()
 
 async def crawl_parallel(urls: List[str], max_concurrent: int = 3):
     process = psutil.Process()
     peak_memory = 0
     all_profiles = []  # Store all profiles across all searches
+    seen_urls = set()  # Bing repeats results across pages, keep each profile once
+    delay = 0.5  # Per-request delay, adapted to how recent requests went
 
     def log_memory(prefix=""):
         nonlocal peak_memory
@@ -137,90 +88,128 @@ async def crawl_parallel(urls: List[str], max_concurrent: int = 3):
         peak_memory = max(peak_memory, current_mem)
         print(f"{prefix}Memory Usage: {current_mem // (1024 * 1024)} MB, Peak: {peak_memory // (1024 * 1024)} MB")
 
-    browser_config = BrowserConfig(
-        headless=False,  # Set to False to see what's happening
-        verbose=True,
-        use_managed_browser=True,
-        browser_type="chromium",
-        extra_args=[
-            "--disable-blink-features=AutomationControlled",
-            "--disable-gpu",
-            "--disable-dev-shm-usage",
-            "--no-sandbox"
-        ]
-    )
+    # Only spin up the browser if some URLs actually need rendering
+    crawler = None
+    if not all(is_static_url(url) for url in urls):
+        browser_config = BrowserConfig(
+            headless=False,  # Set to False to see what's happening
+            verbose=True,
+            use_managed_browser=True,
+            browser_type="chromium",
+            extra_args=[
+                "--disable-blink-features=AutomationControlled",
+                "--disable-gpu",
+                "--disable-dev-shm-usage",
+                "--no-sandbox",
+                "--blink-settings=imagesEnabled=false"
+            ]
+        )
+        
+        # Create crawler with default config
+        default_config = CrawlerRunConfig(
+            wait_until='networkidle',
+            page_timeout=30000
+        )
+        
+        crawler = AsyncWebCrawler(
+            browser_config=browser_config,
+            default_run_config=default_config
+        )
+        crawler.crawler_strategy.set_hook('on_page_context_created', block_heavy_resources_hook)
+        await crawler.start()
+        
+        # Profiles are parsed straight from the HTML, so no markdown pass is needed
+        per_task_config = CrawlerRunConfig(wait_until='networkidle', markdown_generator=NoMarkdownGenerator())
     
-    # Create crawler with default config
-    default_config = CrawlerRunConfig(
-        markdown_generator=DefaultMarkdownGenerator(),
-        wait_until='networkidle',
-        page_timeout=30000
-    )
+    session = aiohttp.ClientSession(headers=STATIC_HEADERS)
+    csv_file, csv_writer = open_profiles_csv()
+
+    # Each slot is a concurrency permit that doubles as a reusable crawl session ID,
+    # so a slot is handed to the next URL as soon as any request finishes
+    slots = asyncio.Queue()
+    for n in range(max_concurrent):
+        slots.put_nowait(f"pool_{n}")
     
-    crawler = AsyncWebCrawler(
-        browser_config=browser_config,
-        default_run_config=default_config
-    )
-    await crawler.start()
+    async def crawl_one(url):
+        nonlocal delay
+        session_id = await slots.get()
+        try:
+            await asyncio.sleep(delay)
+            try:
+                if is_static_url(url):
+                    result = await fetch_static(session, url)
+                else:
+                    result = await crawler.arun(
+                        url=url,
+                        config=per_task_config,
+                        session_id=session_id
+                    )
+            except Exception as e:
+                result = e
 
+            # Back off quickly when requests start failing, speed up again while they succeed
+            if isinstance(result, Exception) or not getattr(result, 'success', True):
+                delay = min(10.0, delay * 2)
+            else:
+                delay = max(0.1, delay * 0.75)
+            return url, result
+        finally:
+            slots.put_nowait(session_id)
+            
+    tasks = [asyncio.create_task(crawl_one(url)) for url in urls]
+    
     try:
-        for i in range(0, len(urls), max_concurrent):
-            batch = urls[i:i + max_concurrent]
-            tasks = []
+        log_memory("Before crawl: ")
+        for done, next_result in enumerate(asyncio.as_completed(tasks), 1):
+            url, result = await next_result
+            log_memory(f"After {done}/{len(urls)} URLs: ")
             
-            for j, url in enumerate(batch):
-                session_id = f"profile_session_{i + j}"
-                task = crawler.arun(
-                    url=url,
-                    config=CrawlerRunConfig(
-                        markdown_generator=DefaultMarkdownGenerator(),
-                        wait_until='networkidle'
-                    ),
-                    session_id=session_id
-                )
-                tasks.append(task)
-
-            log_memory(f"Before batch {i // max_concurrent + 1}: ")
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            log_memory(f"After batch {i // max_concurrent + 1}: ")
-
-            for url, result in zip(batch, results):
-                if isinstance(result, Exception):
-                    logging.error(f"Error crawling {url}: {result}")
-                    print(f"Error crawling {url}: {result}")
-                elif result.success:
-                    print(f"Successfully crawled: {url}")
-                    # Extract search query from URL
-                    search_query = re.search(r'q=hr\+([^+]+)\+linkedin', url).group(1).replace('+', ' ').title()
-                    
-                    # Extract profiles from markdown
-                    profiles = extract_linkedin_profiles(result.markdown, search_query)
-                    
-                    # Print found profiles
-                    for profile in profiles:
-                        print(f"\nFound profile:")
-                        print(f"Name: {profile.name}")
-                        print(f"Designation: {profile.designation}")
-                        print(f"Company: {profile.company}")
-                        print(f"URL: {profile.url}")
-                        print(f"Connections: {profile.connections}")
-                        print("-" * 40)
-                    
-                    all_profiles.extend(profiles)
-                    print(f"Extracted {len(profiles)} profiles from this page")
-                else:
-                    logging.error(f"Failed to crawl: {url}")
-                    print(f"Failed to crawl: {url}")
+            if isinstance(result, Exception):
+                logging.error(f"Error crawling {url}: {result}")
+                print(f"Error crawling {url}: {result}")
+            elif isinstance(result, str) or result.success:
+                print(f"Successfully crawled: {url}")
+                # Static fetches return the HTML itself, browser crawls wrap it in a result
+                html = result if isinstance(result, str) else result.html
+                profiles = extract_profiles_from_html(html)
+                
+                new_profiles = []
+                for profile in profiles:
+                    if profile.url in seen_urls:
+                        continue
+                    seen_urls.add(profile.url)
+                    new_profiles.append(profile)
+                profiles = new_profiles
 
-            # Save batch results to CSV
-            if all_profiles:
-                save_profiles_to_csv(all_profiles, "Multiple Companies HR Search")
-            
-            # Add delay between batches
-            await asyncio.sleep(2)
+                # Print found profiles
+                for profile in profiles:
+                    print(f"\nFound profile:")
+                    print(f"Name: {profile.name}")
+                    print(f"Designation: {profile.designation}")
+                    print(f"Company: {profile.company}")
+                    print(f"URL: {profile.url}")
+                    print(f"Connections: {profile.connections}")
+                    print("-" * 40)
+                
+                all_profiles.extend(profiles)
+                print(f"Extracted {len(profiles)} profiles from this page")
+                
+                # Append only this page's new profiles to the CSV
+                append_profiles(csv_writer, profiles, "Multiple Companies HR Search")
+                csv_file.flush()
+            else:
+                logging.error(f"Failed to crawl: {url}")
+                print(f"Failed to crawl: {url}")
 
     finally:
-        await crawler.close()
+        for task in tasks:
+            task.cancel()
+        # Let cancelled tasks finish their cleanup before the session and crawler go away
+        await asyncio.gather(*tasks, return_exceptions=True)
+        csv_file.close()
+        await session.close()
+        if crawler:
+            await crawler.close()
         print(f"Peak memory usage (MB): {peak_memory // (1024 * 1024)}")
         print(f"Total profiles found: {len(all_profiles)}")
 
@@ -1,239 +1,403 @@
 import asyncio
+import sys
 import os
 from pathlib import Path
 import json
+import re
 import logging
-from datetime import datetime
-from playwright.async_api import async_playwright
+import time
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from browser_pool import BrowserPool
+from scraper_utils import setup_logging, write_json_atomic
 import random
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-    handlers=[
-        logging.FileHandler("linkedin_jobs.log", mode='a', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+setup_logging("linkedin_jobs.log")
+
+# A saved session younger than this is trusted without checking it against LinkedIn
+STORAGE_STATE_MAX_AGE = 6 * 3600
+
+# Attempts for transient page.evaluate/page.goto failures, backing off 0.2s, 0.4s, ...
+MAX_RETRIES = 3
+
+# The jobs search list is filled from one of these voyager JSON endpoints
+VOYAGER_JOBS_MARKERS = ('/voyager/api/voyagerJobsDashJobCards', '/voyager/api/search/hits')
+_JOB_ID_RE = re.compile(r'(\d{6,})')
+
+JOB_CARD_SELECTOR = '.job-card-list__entity-lockup'
+
+def job_key(job_data):
+    """Key a job by the numeric posting id in its link.
+    
+    The DOM and voyager paths link to the same posting with different URLs and
+    tracking tokens, but both links carry the posting id.
+    """
+    job_id = _JOB_ID_RE.search(job_data['job_link'] or '')
+    return job_id.group(1) if job_id else job_data['job_link']
+
+# Installed on every jobs page so extraction only sends a short call over CDP;
+# the field selectors come from window.__SEL, set up by LinkedInJobScraper.INIT_SCRIPT
+EXTRACT_JOBS_SCRIPT = '''window.__SEL_ALL = Object.values(window.__SEL).join(', ');
+window.__extractJobs = (selector) => Array.from(document.querySelectorAll(selector)).map(element => {
+    const SEL = window.__SEL;
+    const data = {
+        title: null, job_link: null, company: null, company_logo: null,
+        location: null, insight: null, tracking_id: null
+    };
+    
+    // Walk the card once with a union of every field selector and dispatch on
+    // which one matched; the first match wins, like querySelector would
+    for (const node of element.querySelectorAll(window.__SEL_ALL)) {
+        if (node.matches(SEL.title)) {
+            // Get job title (fix duplicate title issue) and tracking ID
+            if (data.title === null) {
+                const link = node.closest('a');
+                data.title = node.textContent.trim();
+                data.job_link = link.href;
+                data.tracking_id = link.getAttribute('data-control-id');
+            }
+        } else if (node.matches(SEL.company)) {
+            if (data.company === null) data.company = node.textContent.trim();
+        } else if (node.matches(SEL.company_logo)) {
+            if (data.company_logo === null) data.company_logo = node.src;
+        } else if (node.matches(SEL.location)) {
+            if (data.location === null) data.location = node.textContent.trim();
+        } else if (node.matches(SEL.insight)) {
+            if (data.insight === null) data.insight = node.textContent.trim();
+        } else {
+            // Footer information
+            if (node.textContent.includes('Easy Apply')) {
+                data.easy_apply = true;
+            }
+            if (node.classList.contains('job-card-container__footer-job-state')) {
+                data.status = node.textContent.trim();
+            }
+        }
+    }
+    
+    return data;
+});'''
 
 class LinkedInJobScraper:
+    # Job card field selectors, shipped to each page once as window.__SEL
+    SELECTORS = {
+        'title': 'a.job-card-list__title--link strong',
+        'company': '.artdeco-entity-lockup__subtitle',
+        'company_logo': '.job-card-list__logo img',
+        'location': '.job-card-container__metadata-wrapper li',
+        'insight': '.job-card-container__job-insight-text',
+        'footer': '.job-card-list__footer-wrapper li'
+    }
+    INIT_SCRIPT = f"window.__SEL = {json.dumps(SELECTORS)};\n" + EXTRACT_JOBS_SCRIPT
+
     def __init__(self):
         self.user_data_dir = os.path.join(str(Path.home()), ".linkedin_automation")
-        self.cookies_file = os.path.join(self.user_data_dir, "cookies.json")
+        self.storage_file = os.path.join(self.user_data_dir, "storage_state.json")
+        self.jobs_file = "jobs.jsonl"
         os.makedirs(self.user_data_dir, exist_ok=True)
-        logging.info(f"User data directory: {self.user_data_dir}")
+        logging.info("User data directory: %s", self.user_data_dir)
 
-    async def load_cookies(self, context):
-        """Load cookies if they exist."""
-        try:
-            if os.path.exists(self.cookies_file):
-                logging.info("Found existing cookies file")
-                with open(self.cookies_file, 'r') as f:
-                    cookies = json.load(f)
-                await context.add_cookies(cookies)
-                logging.info(f"Loaded {len(cookies)} cookies")
-                return True
-            return False
-        except Exception as e:
-            logging.error(f"Error loading cookies: {str(e)}")
-            return False
+    @staticmethod
+    def _append_lines(out_fh, lines):
+        out_fh.writelines(lines)
+        out_fh.flush()
 
-    async def save_cookies(self, context):
-        """Save cookies for future use."""
+    async def save_storage_state(self, context):
+        """Save cookies and local storage for future use."""
         try:
-            cookies = await context.cookies()
-            with open(self.cookies_file, 'w') as f:
-                json.dump(cookies, f)
-            logging.info(f"Saved {len(cookies)} cookies")
+            state = await context.storage_state()
+            await asyncio.to_thread(write_json_atomic, self.storage_file, state)
+            logging.info("Saved storage state to %s", self.storage_file)
         except Exception as e:
-            logging.error(f"Error saving cookies: {str(e)}")
+            logging.error("Error saving storage state: %s", e)
 
     async def check_login_status(self, page):
-        """Check if we're logged in by visiting LinkedIn."""
+        """Check if we're logged in, visiting LinkedIn only when the session cookie is missing or expired."""
         try:
+            # li_at is LinkedIn's auth cookie; a live one means the saved session is usable
+            cookies = await page.context.cookies('https://www.linkedin.com')
+            li_at = next((c for c in cookies if c['name'] == 'li_at'), None)
+            if li_at and li_at['expires'] > time.time():
+                return True
+            
             await page.goto('https://www.linkedin.com/feed/')
-            await page.wait_for_timeout(3000)
+            # Resolves as soon as LinkedIn settles on the feed or bounces to the login page
+            await page.wait_for_url(lambda u: 'feed' in u or 'mynetwork' in u or 'login' in u, timeout=10000)
             return 'feed' in page.url or 'mynetwork' in page.url
         except Exception:
             return False
 
-    async def scroll_page(self, page, scroll_delay=500):
+    async def scroll_page(self, page, scroll_delay=150):
         """Scroll the page to load all content."""
         try:
-            prev_height = await page.evaluate('document.body.scrollHeight')
-            while True:
-                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await page.wait_for_timeout(scroll_delay)
-                new_height = await page.evaluate('document.body.scrollHeight')
-                if new_height == prev_height:
-                    break
-                prev_height = new_height
+            # Scroll inside the browser until the height stops growing, so the whole
+            # loop costs one round-trip instead of three per step
+            await page.evaluate('''async (delay) => {
+                let last = 0;
+                while (true) {
+                    window.scrollTo(0, document.body.scrollHeight);
+                    await new Promise(resolve => setTimeout(resolve, delay));
+                    const height = document.body.scrollHeight;
+                    if (height === last) break;
+                    last = height;
+                }
+            }''', scroll_delay)
+            try:
+                await page.wait_for_load_state('networkidle', timeout=5000)
+            except Exception:
+                # LinkedIn keeps analytics requests open, the cards are already loaded
+                pass
         except Exception as e:
-            logging.error(f"Error during scrolling: {str(e)}")
+            logging.error("Error during scrolling: %s", e)
 
-    async def extract_job_info(self, job_elem):
-        """Extract job information from a job card."""
-        try:
-            job_data = await job_elem.evaluate('''(element) => {
-                const data = {};
-                
-                // Get job title (fix duplicate title issue)
-                const titleElem = element.querySelector('a.job-card-list__title--link strong');
-                data.title = titleElem ? titleElem.textContent.trim() : null;
-                data.job_link = titleElem ? titleElem.closest('a').href : null;
-                
-                // Get company name and logo
-                const companyElem = element.querySelector('.artdeco-entity-lockup__subtitle');
-                data.company = companyElem ? companyElem.textContent.trim() : null;
-                
-                const companyLogo = element.querySelector('.job-card-list__logo img');
-                data.company_logo = companyLogo ? companyLogo.src : null;
-                
-                // Get location
-                const locationElem = element.querySelector('.job-card-container__metadata-wrapper li');
-                data.location = locationElem ? locationElem.textContent.trim() : null;
-                
-                // Get application insights
-                const insightElem = element.querySelector('.job-card-container__job-insight-text');
-                data.insight = insightElem ? insightElem.textContent.trim() : null;
-                
-                // Get footer information
-                const footerItems = element.querySelectorAll('.job-card-list__footer-wrapper li');
-                footerItems.forEach(item => {
-                    if (item.textContent.includes('Easy Apply')) {
-                        data.easy_apply = true;
-                    }
-                    if (item.classList.contains('job-card-container__footer-job-state')) {
-                        data.status = item.textContent.trim();
-                    }
-                });
-                
-                // Get tracking ID
-                const trackingId = titleElem ? titleElem.closest('a').getAttribute('data-control-id') : null;
-                data.tracking_id = trackingId;
-                
-                return data;
-            }''')
-            return job_data
-        except Exception as e:
-            logging.error(f"Error extracting job info: {str(e)}")
-            return None
+    async def extract_all_jobs(self, page, selector=JOB_CARD_SELECTOR):
+        """Extract information from every job card on the page in a single evaluate call."""
+        for attempt in range(MAX_RETRIES):
+            try:
+                jobs_data = await page.evaluate('(selector) => window.__extractJobs(selector)', selector)
+                return jobs_data
+            except PlaywrightError as e:
+                logging.warning("Error extracting job info (attempt %d/%d): %s", attempt + 1, MAX_RETRIES, e)
+                await asyncio.sleep(0.2 * 2 ** attempt)
+        logging.error("Giving up extracting job info after %d attempts", MAX_RETRIES)
+        return []
 
-    async def print_job_info(self, job_data, idx):
-        """Print formatted job information."""
-        if not job_data:
-            return
-            
-        print(f"\nJob {idx}:")
-        print("=" * 60)
-        print(f"Title: {job_data['title']}")
+    async def goto_with_retry(self, page, url, **kwargs):
+        """Navigate to url, retrying timeouts with exponential backoff."""
+        for attempt in range(MAX_RETRIES):
+            try:
+                return await page.goto(url, **kwargs)
+            except PlaywrightTimeoutError as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                logging.warning("Timed out loading %s (attempt %d/%d): %s", url, attempt + 1, MAX_RETRIES, e)
+                await asyncio.sleep(0.2 * 2 ** attempt)
+
+    def format_job_info(self, job_data, idx):
+        """Format job information as a printable block."""
+        lines = [f"\nJob {idx}:", "=" * 60, f"Title: {job_data['title']}"]
         if job_data['company']:
-            print(f"Company: {job_data['company']}")
+            lines.append(f"Company: {job_data['company']}")
         if job_data['location']:
-            print(f"Location: {job_data['location']}")
+            lines.append(f"Location: {job_data['location']}")
         if job_data['insight']:
-            print(f"Insight: {job_data['insight']}")
+            lines.append(f"Insight: {job_data['insight']}")
         if job_data.get('status'):
-            print(f"Status: {job_data['status']}")
+            lines.append(f"Status: {job_data['status']}")
         if job_data.get('easy_apply'):
-            print("Application: Easy Apply")
-        print(f"Job Link: {job_data['job_link']}")
+            lines.append("Application: Easy Apply")
+        lines.append(f"Job Link: {job_data['job_link']}")
         if job_data['company_logo']:
-            print(f"Company Logo: {job_data['company_logo']}")
-        print("=" * 60)
+            lines.append(f"Company Logo: {job_data['company_logo']}")
+        lines.append("=" * 60)
+        return '\n'.join(lines)
 
-    async def scrape_jobs(self, job_url: str):
-        """Scrape jobs from LinkedIn jobs page."""
-        logging.info(f"Starting LinkedIn job scraping")
-        start_time = datetime.now()
-        browser = None
+    def parse_voyager_jobs(self, data):
+        """Build job dicts, shaped like extract_all_jobs output, from a voyager job cards response.
+        
+        The card JSON differs from the rendered card in a few fields: job_link is the
+        canonical /jobs/view/<id>/ URL rather than the tracked href, tracking_id is the
+        card's trackingId rather than the link's data-control-id, and company_logo and
+        status are always None because the card only references the logo and doesn't
+        carry the applied/viewed state. easy_apply comes from the footer items, like the
+        DOM path reads it from the footer text. Use job_key() to match jobs across paths.
+        """
+        jobs_data = []
+        for item in data.get('included', []):
+            if 'jobPostingTitle' not in item:
+                continue
+            job_id = _JOB_ID_RE.search(item.get('jobPostingUrn') or item.get('entityUrn', ''))
+            job_data = {
+                'title': item['jobPostingTitle'],
+                'job_link': f"https://www.linkedin.com/jobs/view/{job_id.group(1)}/" if job_id else None,
+                'company': (item.get('primaryDescription') or {}).get('text'),
+                'company_logo': None,
+                'location': (item.get('secondaryDescription') or {}).get('text'),
+                'insight': (item.get('tertiaryDescription') or {}).get('text'),
+                'tracking_id': item.get('trackingId'),
+                'status': None
+            }
+            footer_text = ' '.join((footer.get('text') or {}).get('text') or '' for footer in item.get('footerItems') or [])
+            if 'Easy Apply' in footer_text:
+                job_data['easy_apply'] = True
+            jobs_data.append(job_data)
+        return jobs_data
 
-        try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=False,
-                    args=[
-                        "--disable-blink-features=AutomationControlled",
-                        "--disable-gpu",
-                        "--disable-dev-shm-usage",
-                        "--no-sandbox"
-                    ]
-                )
+    async def fetch_jobs_api(self, page, api_url):
+        """Fetch job cards straight from the voyager endpoint the search page called."""
+        cookies = {c['name']: c['value'] for c in await page.context.cookies('https://www.linkedin.com')}
+        # Voyager expects the JSESSIONID value echoed back as the CSRF token
+        response = await page.context.request.get(api_url, headers={
+            'csrf-token': cookies.get('JSESSIONID', '').strip('"'),
+            'accept': 'application/vnd.linkedin.normalized+json+2.1'
+        })
+        if not response.ok:
+            logging.warning("Voyager jobs request returned %d", response.status)
+            return []
+        return self.parse_voyager_jobs(await response.json())
+
+    async def scrape_job_url(self, context, sem, job_url):
+        """Scrape a single jobs URL on its own page, bounded by the shared semaphore."""
+        async with sem:
+            page = await context.new_page()
+            await page.add_init_script(self.INIT_SCRIPT)
+            # Remember the voyager call the page makes so the list can be fetched as JSON
+            api_urls = []
+            api_seen = asyncio.Event()
+            def on_request(request):
+                if any(marker in request.url for marker in VOYAGER_JOBS_MARKERS):
+                    api_urls.append(request.url)
+                    api_seen.set()
+            page.on('request', on_request)
+            try:
+                logging.info("Navigating to jobs URL: %s", job_url)
+                await self.goto_with_retry(page, job_url, wait_until='domcontentloaded', timeout=30000)
+                
+                # Go with whichever comes first: the list's voyager call, which is fetched as
+                # JSON without waiting for any card to render, or the rendered cards themselves
+                waiters = [
+                    asyncio.create_task(api_seen.wait()),
+                    asyncio.create_task(page.wait_for_selector(JOB_CARD_SELECTOR, timeout=15000))
+                ]
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                for waiter in waiters:
+                    waiter.cancel()
+                await asyncio.gather(*waiters, return_exceptions=True)
+                
+                if api_urls:
+                    try:
+                        jobs_data = await self.fetch_jobs_api(page, api_urls[0])
+                        if jobs_data:
+                            logging.info("Found %d job listings on %s via the voyager API", len(jobs_data), job_url)
+                            return jobs_data
+                    except Exception as e:
+                        logging.warning("Voyager jobs request failed, falling back to the page: %s", e)
                 
-                context = await browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/121.0.0.0 Safari/537.36'
-                )
+                # Returns at once if the cards won the race above
+                await page.wait_for_selector(JOB_CARD_SELECTOR, timeout=15000)
+                logging.info("Scrolling to load all job listings...")
+                await self.scroll_page(page)
+                
+                logging.info("Extracting job listings...")
+                jobs_data = await self.extract_all_jobs(page)
+                logging.info("Found %d job listings on %s", len(jobs_data), job_url)
+                return jobs_data
+            except Exception as e:
+                logging.error("Error scraping %s: %s", job_url, e)
+                return []
+            finally:
+                await page.close()
+
+    async def scrape_jobs(self, job_urls: str | list[str], max_parallel: int = 5, pool: BrowserPool = None, verbose: bool = False):
+        """Scrape jobs from LinkedIn jobs pages, up to max_parallel pages at a time."""
+        # A single URL would otherwise be iterated one character at a time
+        if isinstance(job_urls, str):
+            job_urls = [job_urls]
+        logging.info("Starting LinkedIn job scraping")
+        start_time = time.perf_counter()
+        # Without a caller-supplied pool, launch a private one for just this run
+        owns_pool = pool is None
+        if owns_pool:
+            pool = BrowserPool(headless=True)
+
+        try:
+            # Storage state restores cookies and local storage when the context is created
+            storage_state = self.storage_file if os.path.exists(self.storage_file) else None
+            async with pool.shared_context(storage_state=storage_state) as context:
                 page = await context.new_page()
                 
                 try:
-                    cookies_loaded = await self.load_cookies(context)
-                    if cookies_loaded:
-                        logging.info("Checking if cookies are valid...")
-                        if await self.check_login_status(page):
-                            logging.info("Successfully logged in using cookies")
+                    logged_in = False
+                    if storage_state and time.time() - os.path.getmtime(self.storage_file) < STORAGE_STATE_MAX_AGE:
+                        logging.info("Saved session is fresh, skipping login check")
+                        logged_in = True
+                    elif storage_state:
+                        logging.info("Checking if saved session is valid...")
+                        logged_in = await self.check_login_status(page)
+                        if logged_in:
+                            logging.info("Successfully logged in using saved session")
                         else:
-                            logging.info("Cookies expired, proceeding with manual login")
-                            await self.perform_login(page, context)
+                            logging.info("Saved session expired, proceeding with manual login")
+                            logged_in = await self.perform_login(page, context)
                     else:
-                        logging.info("No cookies found, proceeding with manual login")
-                        await self.perform_login(page, context)
-
-                    if 'feed' in page.url or 'mynetwork' in page.url:
-                        logging.info(f"Navigating to jobs URL: {job_url}")
-                        await page.goto(job_url, wait_until='domcontentloaded', timeout=30000)
-                        await page.wait_for_timeout(2000)
-                        
-                        logging.info("Scrolling to load all job listings...")
-                        await self.scroll_page(page)
-                        
-                        logging.info("Finding job elements...")
-                        job_elements = await page.query_selector_all('.job-card-list__entity-lockup')
-                        logging.info(f"Found {len(job_elements)} job listings")
+                        logging.info("No saved session found, proceeding with manual login")
+                        logged_in = await self.perform_login(page, context)
+                    
+                    if logged_in:
+                        # Cookies live on the shared context, so every page below is logged in
+                        sem = asyncio.Semaphore(max_parallel)
+                        tasks = [asyncio.create_task(self.scrape_job_url(context, sem, job_url)) for job_url in job_urls]
                         
-                        # Process jobs in batches
-                        batch_size = 5
-                        for i in range(0, len(job_elements), batch_size):
-                            batch = job_elements[i:i + batch_size]
-                            
-                            # Extract job information concurrently
-                            tasks = [self.extract_job_info(elem) for elem in batch]
-                            jobs_data = await asyncio.gather(*tasks)
-                            
-                            for idx, job_data in enumerate(jobs_data, i + 1):
-                                if not job_data:
-                                    continue
-                                
-                                await self.print_job_info(job_data, idx)
-                            
-                            # Small delay between batches
-                            await asyncio.sleep(0.5)
+                        # One JSON object per line so results survive crashes and feed other tools;
+                        # each URL's jobs are flushed as soon as its page finishes, with the file
+                        # I/O on a worker thread. The human-readable report is verbose-only
+                        outputs = []
+                        seen_ids = set()
+                        found = 0
+                        written = 0
+                        out_fh = await asyncio.to_thread(open, self.jobs_file, 'a', encoding='utf-8')
+                        try:
+                            for next_jobs in asyncio.as_completed(tasks):
+                                url_jobs = await next_jobs
+                                found += len(url_jobs)
+                                lines = []
+                                for job_data in url_jobs:
+                                    if not job_data:
+                                        continue
+                                    
+                                    # The same posting shows up on overlapping searches and re-rendered lists,
+                                    # and through either the voyager or the DOM path
+                                    job_id = job_key(job_data)
+                                    # Cards without a title link have no key at all; keep each of
+                                    # them rather than collapsing them all into one
+                                    if job_id is not None:
+                                        if job_id in seen_ids:
+                                            continue
+                                        seen_ids.add(job_id)
+                                    written += 1
+                                    
+                                    lines.append(json.dumps(job_data, ensure_ascii=False) + '\n')
+                                    if verbose:
+                                        outputs.append(self.format_job_info(job_data, written))
+                                await asyncio.to_thread(self._append_lines, out_fh, lines)
+                        finally:
+                            for task in tasks:
+                                task.cancel()
+                            # Let cancelled pages close before the shared context is handed back
+                            await asyncio.gather(*tasks, return_exceptions=True)
+                            await asyncio.to_thread(out_fh.close)
+                        logging.info("Found %d job listings across %d URLs", found, len(job_urls))
+                        logging.info("Wrote %d jobs to %s", written, self.jobs_file)
+                        if outputs:
+                            sys.stdout.write('\n'.join(outputs) + '\n')
                             
                     else:
-                        logging.error(f"Login failed. Current URL: {page.url}")
+                        logging.error("Login failed. Current URL: %s", page.url)
                         
                 except Exception as e:
-                    logging.error(f"Error during scraping: {str(e)}", exc_info=True)
+                    logging.error("Error during scraping: %s", e, exc_info=True)
                 finally:
-                    if browser:
-                        await browser.close()
+                    # The context is shared across runs, so only this run's page is closed
+                    await page.close()
                     
-                    end_time = datetime.now()
-                    duration = end_time - start_time
-                    logging.info(f"Scraping completed in {duration.total_seconds():.2f} seconds")
+                    logging.info("Scraping completed in %.2f seconds", time.perf_counter() - start_time)
                     
         except KeyboardInterrupt:
             logging.info("Scraping interrupted by user")
-            if browser:
-                await browser.close()
         except Exception as e:
-            logging.error(f"Fatal error: {str(e)}", exc_info=True)
-            if browser:
-                await browser.close()
+            logging.error("Fatal error: %s", e, exc_info=True)
+        finally:
+            if owns_pool:
+                await pool.shutdown()
 
     async def perform_login(self, page, context):
-        """Handle the login process and save cookies on success."""
+        """Handle the login process and save the session on success."""
+        username = os.environ.get('LI_USER')
+        password = os.environ.get('LI_PASS')
+        if not username or not password:
+            logging.error("LI_USER and LI_PASS must be set to log in")
+            return False
+        
         try:
             logging.info("Navigating to login page...")
             await page.goto('https://www.linkedin.com/login')
@@ -241,22 +405,26 @@ class LinkedInJobScraper:
             await page.wait_for_selector('#username', timeout=5000)
             await page.wait_for_selector('#password', timeout=5000)
             
-            await page.fill('#username', 'anujpatil917@gmail.com')
-            await page.fill('#password', 'Anuj@789@anuj')
+            await page.fill('#username', username)
+            await page.fill('#password', password)
             await page.click('button[type="submit"]')
             
-            await page.wait_for_timeout(5000)
+            try:
+                await page.wait_for_url(lambda u: 'feed' in u or 'mynetwork' in u or 'checkpoint' in u, timeout=15000)
+            except Exception:
+                # Still on the login form (bad credentials), reported below
+                pass
             
             if 'feed' in page.url or 'mynetwork' in page.url:
                 logging.info("Successfully logged in manually")
-                await self.save_cookies(context)
+                await self.save_storage_state(context)
                 return True
             else:
                 logging.error("Login failed")
                 return False
                 
         except Exception as e:
-            logging.error(f"Error during login: {str(e)}")
+            logging.error("Error during login: %s", e)
             return False
 
 async def main():
@@ -266,12 +434,9 @@ async def main():
     
     try:
         scraper = LinkedInJobScraper()
-        await scraper.scrape_jobs(job_url)
+        await scraper.scrape_jobs([job_url], verbose='--verbose' in sys.argv)
     except Exception as e:
-        logging.error(f"Fatal error in main: {str(e)}", exc_info=True)
-    finally:
-        loop = asyncio.get_event_loop()
-        await loop.shutdown_asyncgens()
-        
+        logging.error("Fatal error in main: %s", e, exc_info=True)
+
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
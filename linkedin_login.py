@@ -2,204 +2,286 @@ import asyncio
 import sys
 import os
 from pathlib import Path
-import json
-from datetime import datetime
 import logging
-from playwright.async_api import async_playwright
+import time
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from browser_pool import BrowserPool
+from scraper_utils import setup_logging
 import random
-import urllib.parse
+from urllib.parse import quote_plus
+import re
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-    handlers=[
-        logging.FileHandler("linkedin_scraper.log", mode='a', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+setup_logging("linkedin_scraper.log")
+
+# Concurrent search pages; kept low to stay under LinkedIn's bot-detection thresholds
+MAX_PARALLEL_PAGES = 3
+
+# Start delays for search tasks, 1-2s in 100ms steps
+JITTER_STEPS = [1 + step / 10 for step in range(11)]
+
+# Searches a pooled page serves before it is replaced, so renderer memory doesn't keep growing
+PAGE_MAX_USES = 20
+
+# Navigation timeout; a stalled load is retried once rather than waited out
+NAV_TIMEOUT = 15000
+
+async def _goto(page, url):
+    """Navigate to url, retrying once if the page doesn't reach domcontentloaded in time."""
+    for attempt in range(2):
+        try:
+            return await page.goto(url, wait_until='domcontentloaded', timeout=NAV_TIMEOUT)
+        except PlaywrightTimeoutError:
+            if attempt == 1:
+                raise
+            logging.warning(f"Timed out loading {url}, retrying")
+
+# Captures the profile slug from a LinkedIn /in/ URL
+_IN_RE = re.compile(r'/in/([^/?#]+)')
+
+# Profile card and per-field selectors on the people search results page; the
+# fields are tried in this order, so the name span is the fallback for anything else
+_PROFILE_CARD_SEL = 'div.jlAahycHCtXuARzUjbWOsTOgMcDTRYHE'
+_PROFILE_FIELD_SELS = {
+    'url': 'a.SGlfjVgIoCjdRzagDUhwgwvdZMwzddAtECE[href*="/in/"]',
+    'image_url': 'img',
+    'designation': 'div.zdqSzrbjAHpnNueSDOUajcZNRGFoPfYvdRY',
+    'location': 'div.ZJlaILSysBzJXmOfoyWeXNACmszynFiQwubGk',
+    'name': 'a.SGlfjVgIoCjdRzagDUhwgwvdZMwzddAtECE span[dir="ltr"] span[aria-hidden="true"]'
+}
+
+_PROFILE_BATCH_JS = '''([selector, fields]) => {
+    const entries = Object.entries(fields);
+    const union = Object.values(fields).join(', ');
+    return Array.from(document.querySelectorAll(selector)).map(element => {
+        const data = {
+            url: null, name: "Name not found", image_url: null, designation: null, location: null
+        };
+        const found = new Set();
+        
+        // Walk the card once with a union of every field selector and dispatch on
+        // which one matched; the first match wins, like querySelector would
+        for (const node of element.querySelectorAll(union)) {
+            const [field] = entries.find(([, fieldSelector]) => node.matches(fieldSelector));
+            if (found.has(field)) continue;
+            found.add(field);
+            
+            if (field === 'url') data.url = node.href;
+            else if (field === 'image_url') data.image_url = node.src;
+            else data[field] = node.textContent.trim();
+        }
+        
+        return data;
+    });
+}'''
 
 class LinkedInScraper:
     def __init__(self):
         self.user_data_dir = os.path.join(str(Path.home()), ".linkedin_automation")
-        self.cookies_file = os.path.join(self.user_data_dir, "cookies.json")
+        self.profile_dir = os.path.join(self.user_data_dir, "chromium_profile")
         os.makedirs(self.user_data_dir, exist_ok=True)
         logging.info(f"User data directory: {self.user_data_dir}")
-
-    async def load_cookies(self, context):
-        """Load cookies if they exist."""
-        try:
-            if os.path.exists(self.cookies_file):
-                logging.info("Found existing cookies file")
-                with open(self.cookies_file, 'r') as f:
-                    cookies = json.load(f)
-                await context.add_cookies(cookies)
-                logging.info(f"Loaded {len(cookies)} cookies")
-                return True
-            return False
-        except Exception as e:
-            logging.error(f"Error loading cookies: {str(e)}")
-            return False
-
-    async def save_cookies(self, context):
-        """Save cookies for future use."""
-        try:
-            cookies = await context.cookies()
-            with open(self.cookies_file, 'w') as f:
-                json.dump(cookies, f)
-            logging.info(f"Saved {len(cookies)} cookies")
-        except Exception as e:
-            logging.error(f"Error saving cookies: {str(e)}")
+        # Search pages kept open on the shared context between runs, see _fill_page_pool
+        self._page_pool = None
+        self._page_pool_context = None
+        self._page_pool_size = 0
 
     async def check_login_status(self, page):
         """Check if we're logged in by visiting LinkedIn."""
         try:
-            await page.goto('https://www.linkedin.com/feed/')
-            await page.wait_for_timeout(3000)
+            await _goto(page, 'https://www.linkedin.com/feed/')
+            # Resolves as soon as LinkedIn settles on the feed or bounces to the login page
+            await page.wait_for_url(lambda u: 'feed' in u or 'mynetwork' in u or 'login' in u, timeout=10000)
             return 'feed' in page.url or 'mynetwork' in page.url
         except Exception:
             return False
 
-    async def scroll_page(self, page, scroll_delay=500):
-        """Scroll the page to load all content."""
+    async def scroll_page(self, page, idle_ms=400, stable_checks=3, target_count=None, selector=None):
+        """Scroll the page to load all content, or until target_count elements match selector."""
         try:
-            prev_height = await page.evaluate('document.body.scrollHeight')
-            while True:
-                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await page.wait_for_timeout(scroll_delay)
-                new_height = await page.evaluate('document.body.scrollHeight')
-                if new_height == prev_height:
-                    break
-                prev_height = new_height
+            # Scroll again as soon as new content grows the page, and finish once the height
+            # has held still for stable_checks checks idle_ms apart, so a lazy load slower
+            # than one check doesn't end scrolling early.
+            # LinkedIn keeps appending results, so stop early once there are enough cards
+            await page.evaluate('''([idleMs, stableChecks, targetCount, selector]) => new Promise(resolve => {
+                let last = document.body.scrollHeight;
+                let stable = 0;
+                const enough = () => targetCount && document.querySelectorAll(selector).length >= targetCount;
+                if (enough()) return resolve(last);
+                
+                const grow = height => {
+                    last = height;
+                    stable = 0;
+                    window.scrollTo(0, height);
+                };
+                const finish = () => {
+                    clearInterval(timer);
+                    observer.disconnect();
+                    resolve(document.body.scrollHeight);
+                };
+                const observer = new MutationObserver(() => {
+                    const height = document.body.scrollHeight;
+                    if (height <= last) return;
+                    if (enough()) return finish();
+                    grow(height);
+                });
+                const timer = setInterval(() => {
+                    const height = document.body.scrollHeight;
+                    if (height > last) return enough() ? finish() : grow(height);
+                    if (++stable >= stableChecks) finish();
+                }, idleMs);
+                observer.observe(document.body, { childList: true, subtree: true });
+                window.scrollTo(0, last);
+            })''', [idle_ms, stable_checks, target_count, selector])
         except Exception as e:
             logging.error(f"Error during scrolling: {str(e)}")
 
-    async def extract_profile_info(self, profile_elem):
-        """Extract all profile information in a single evaluation call."""
+    async def extract_all_profiles(self, page, selector=_PROFILE_CARD_SEL):
+        """Extract information for every profile card on the page in a single evaluation call."""
         try:
-            profile_data = await profile_elem.evaluate('''(element) => {
-                const data = {};
-                
-                // Get profile URL
-                const anchor = element.querySelector('a.SGlfjVgIoCjdRzagDUhwgwvdZMwzddAtECE[href*="/in/"]');
-                data.url = anchor ? anchor.href : null;
-                
-                // Get name
-                const nameSpan = element.querySelector('a.SGlfjVgIoCjdRzagDUhwgwvdZMwzddAtECE span[dir="ltr"] span[aria-hidden="true"]');
-                data.name = nameSpan ? nameSpan.textContent.trim() : "Name not found";
-                
-                // Get image URL
-                const img = element.querySelector('img');
-                data.image_url = img ? img.src : null;
-                
-                // Get designation
-                const designation = element.querySelector('div.zdqSzrbjAHpnNueSDOUajcZNRGFoPfYvdRY');
-                data.designation = designation ? designation.textContent.trim() : null;
-                
-                // Get location
-                const location = element.querySelector('div.ZJlaILSysBzJXmOfoyWeXNACmszynFiQwubGk');
-                data.location = location ? location.textContent.trim() : null;
-                
-                return data;
-            }''')
-            return profile_data
+            profiles_data = await page.evaluate(_PROFILE_BATCH_JS, [selector, _PROFILE_FIELD_SELS])
+            return profiles_data
         except Exception as e:
             logging.error(f"Error extracting profile info: {str(e)}")
-            return None
+            return []
 
-    async def scrape_profiles(self, search_query: str, max_profiles: int = 20):
-        logging.info(f"Starting LinkedIn scraping for query: {search_query}")
-        start_time = datetime.now()
-        browser = None
+    async def _fill_page_pool(self, context, size):
+        """Make the search page pool hold size pages on context, reusing earlier runs' pages."""
+        if self._page_pool_context is not context:
+            # First run, or the browser pool handed out a new context whose pages are all new
+            self._page_pool = asyncio.Queue()
+            self._page_pool_context = context
+            self._page_pool_size = 0
+        # Close idle pages beyond size so the pool still bounds this run's concurrency
+        while self._page_pool_size > size and not self._page_pool.empty():
+            page, _ = self._page_pool.get_nowait()
+            self._page_pool_size -= 1
+            await page.close()
+        while self._page_pool_size < size:
+            self._page_pool.put_nowait((await context.new_page(), 0))
+            self._page_pool_size += 1
 
+    async def scrape_query(self, context, search_query, max_profiles, delay):
+        """Run a single people search on a page checked out of the scraper's page pool."""
+        # Waiting on the pool bounds concurrency to its size
+        pages = self._page_pool
+        page, uses = await pages.get()
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-blink-features=AutomationControlled",
-                        "--disable-gpu",
-                        "--disable-dev-shm-usage",
-                        "--no-sandbox"
-                    ]
-                )
-                
-                context = await browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/121.0.0.0 Safari/537.36'
-                )
-                page = await context.new_page()
+            if page.is_closed():
+                # Crashed or closed while it sat in the pool
+                page, uses = await context.new_page(), 0
+            # Jitter inside the task so the pages don't all hit LinkedIn in lockstep
+            await asyncio.sleep(delay)
+            encoded_query = quote_plus(search_query)
+            search_url = f'https://www.linkedin.com/search/results/people/?keywords={encoded_query}&origin=SWITCH_SEARCH_VERTICAL'
+            logging.info(f"Navigating to search URL: {search_url}")
+            
+            await _goto(page, search_url)
+            await page.wait_for_selector('.search-results-container', timeout=30000)
+            
+            logging.info("Scrolling to load all results...")
+            await self.scroll_page(page, target_count=max_profiles, selector=_PROFILE_CARD_SEL)
+            
+            logging.info("Extracting profile elements...")
+            # Drop cards without a profile link and repeated profiles before applying
+            # the cap, so duplicates don't eat into max_profiles
+            unique_profiles = {}
+            for profile_data in await self.extract_all_profiles(page):
+                match = _IN_RE.search(profile_data['url'] or '')
+                if match and match.group(1) not in unique_profiles:
+                    # Keep the canonical profile URL without tracking params
+                    profile_data['url'] = profile_data['url'][:match.end()]
+                    unique_profiles[match.group(1)] = profile_data
+            profiles_data = list(unique_profiles.values())[:max_profiles]
+            logging.info(f"Found {len(profiles_data)} profile elements for '{search_query}'")
+            return profiles_data
+        except Exception as e:
+            logging.error(f"Error searching for '{search_query}': {str(e)}")
+            return []
+        finally:
+            uses += 1
+            try:
+                if uses >= PAGE_MAX_USES or page.is_closed():
+                    await page.close()
+                    page, uses = await context.new_page(), 0
+            except BaseException:
+                # Cancelled or failed mid-recycle: the page never goes back to the pool,
+                # so close it here rather than leak it
+                self._page_pool_size -= 1
+                await page.close()
+                raise
+            pages.put_nowait((page, uses))
+
+    async def scrape_profiles(self, search_queries: str | list[str], max_profiles: int = 20, max_parallel: int = MAX_PARALLEL_PAGES, pool: BrowserPool = None):
+        # A single query would otherwise be iterated one character at a time
+        if isinstance(search_queries, str):
+            search_queries = [search_queries]
+        logging.info(f"Starting LinkedIn scraping for queries: {search_queries}")
+        start_time = time.perf_counter()
+        # Without a caller-supplied pool, launch a private one for just this run
+        owns_pool = pool is None
+        if owns_pool:
+            pool = BrowserPool(headless=True)
+
+        try:
+            # The persistent profile keeps cookies, storage and cache on disk between runs
+            async with pool.shared_context(user_data_dir=self.profile_dir) as context:
+                # A fresh context's startup tab is free to use; on later runs the context's
+                # open pages are the pooled search pages, so open a separate one
+                if self._page_pool_context is not context and context.pages:
+                    page = context.pages[0]
+                else:
+                    page = await context.new_page()
                 
                 try:
-                    cookies_loaded = await self.load_cookies(context)
-                    if cookies_loaded:
-                        logging.info("Checking if cookies are valid...")
-                        if await self.check_login_status(page):
-                            logging.info("Successfully logged in using cookies")
-                        else:
-                            logging.info("Cookies expired, proceeding with manual login")
-                            await self.perform_login(page, context)
+                    logging.info("Checking if saved session is valid...")
+                    if await self.check_login_status(page):
+                        logging.info("Successfully logged in using saved session")
                     else:
-                        logging.info("No cookies found, proceeding with manual login")
+                        logging.info("No valid session, proceeding with manual login")
                         await self.perform_login(page, context)
 
                     if 'feed' in page.url or 'mynetwork' in page.url:
-                        encoded_query = urllib.parse.quote(search_query)
-                        search_url = f'https://www.linkedin.com/search/results/people/?keywords={encoded_query}&origin=SWITCH_SEARCH_VERTICAL'
-                        logging.info(f"Navigating to search URL: {search_url}")
-                        
-                        await page.goto(search_url, wait_until='domcontentloaded', timeout=30000)
-                        await page.wait_for_timeout(2000)
-                        
-                        await page.wait_for_selector('.search-results-container', timeout=30000)
-                        
-                        logging.info("Scrolling to load all results...")
-                        await self.scroll_page(page)
+                        # The feed is heavy and no longer needed; free its renderer before
+                        # the search pages open
+                        await page.close()
                         
-                        logging.info("Finding profile elements...")
-                        profile_elements = await page.query_selector_all('div.jlAahycHCtXuARzUjbWOsTOgMcDTRYHE')
-                        logging.info(f"Found {len(profile_elements)} profile elements")
+                        # Cookies and resource blocking live on the shared context, so every
+                        # pooled search page is logged in without per-page setup
+                        await self._fill_page_pool(context, min(max_parallel, len(search_queries)))
+                        # Draw every task's 1-2s start jitter up front in one call
+                        delays = random.choices(JITTER_STEPS, k=len(search_queries))
+                        # The task group cancels and awaits every search if one fails or the
+                        # run is interrupted; each returns its page to the pool, which stays
+                        # open on the shared context for the next run
+                        async with asyncio.TaskGroup() as tg:
+                            tasks = [tg.create_task(self.scrape_query(context, query, max_profiles, delay))
+                                     for query, delay in zip(search_queries, delays)]
+                        results = [task.result() for task in tasks]
+                        # URLs are already canonical per query, so one dict pass drops
+                        # profiles that several searches returned, keeping the first
+                        unique_profiles = {}
+                        for query_profiles in results:
+                            for profile_data in query_profiles:
+                                unique_profiles.setdefault(profile_data['url'], profile_data)
+                        profiles_data = list(unique_profiles.values())
                         
-                        processed_urls = set()
                         profiles_processed = 0
                         
-                        # Process profiles in batches for better performance
-                        batch_size = 5
-                        for i in range(0, min(len(profile_elements), max_profiles), batch_size):
-                            batch = profile_elements[i:min(i + batch_size, max_profiles)]
+                        for profile_data in profiles_data:
+                            print(f"\nProfile {profiles_processed + 1}:")
+                            print("=" * 40)
+                            print(f"Name: {profile_data['name']}")
+                            if profile_data['designation']:
+                                print(f"Designation: {profile_data['designation']}")
+                            if profile_data['location']:
+                                print(f"Location: {profile_data['location']}")
+                            print(f"LinkedIn URL: {profile_data['url']}")
+                            if profile_data['image_url']:
+                                print(f"Profile Image: {profile_data['image_url']}")
+                            print("=" * 40)
                             
-                            # Extract profile information concurrently
-                            tasks = [self.extract_profile_info(elem) for elem in batch]
-                            profiles_data = await asyncio.gather(*tasks)
-                            
-                            for profile_data in profiles_data:
-                                if not profile_data or not profile_data['url'] or profile_data['url'] in processed_urls:
-                                    continue
-                                
-                                if '?' in profile_data['url']:
-                                    profile_data['url'] = profile_data['url'].split('?')[0]
-                                
-                                if profile_data['url'] in processed_urls:
-                                    continue
-                                
-                                processed_urls.add(profile_data['url'])
-                                
-                                print(f"\nProfile {profiles_processed + 1}:")
-                                print("=" * 40)
-                                print(f"Name: {profile_data['name']}")
-                                if profile_data['designation']:
-                                    print(f"Designation: {profile_data['designation']}")
-                                if profile_data['location']:
-                                    print(f"Location: {profile_data['location']}")
-                                print(f"LinkedIn URL: {profile_data['url']}")
-                                if profile_data['image_url']:
-                                    print(f"Profile Image: {profile_data['image_url']}")
-                                print("=" * 40)
-                                
-                                profiles_processed += 1
-                                
-                            # Small delay between batches
-                            await asyncio.sleep(0.5)
+                            profiles_processed += 1
                             
                     else:
                         logging.error(f"Login failed. Current URL: {page.url}")
@@ -207,40 +289,46 @@ class LinkedInScraper:
                 except Exception as e:
                     logging.error(f"Error during scraping: {str(e)}", exc_info=True)
                 finally:
-                    if browser:
-                        await browser.close()
+                    # The context is shared across runs, so only this run's page is closed
+                    await page.close()
                     
-                    end_time = datetime.now()
-                    duration = end_time - start_time
-                    logging.info(f"Scraping completed in {duration.total_seconds():.2f} seconds")
+                    logging.info(f"Scraping completed in {time.perf_counter() - start_time:.2f} seconds")
                     
         except KeyboardInterrupt:
             logging.info("Scraping interrupted by user")
-            if browser:
-                await browser.close()
         except Exception as e:
             logging.error(f"Fatal error: {str(e)}", exc_info=True)
-            if browser:
-                await browser.close()
+        finally:
+            if owns_pool:
+                await pool.shutdown()
 
     async def perform_login(self, page, context):
-        """Handle the login process and save cookies on success."""
+        """Handle the login process; the persistent profile keeps the session."""
+        username = os.environ.get('LI_USER')
+        password = os.environ.get('LI_PASS')
+        if not username or not password:
+            logging.error("LI_USER and LI_PASS must be set to log in")
+            return False
+        
         try:
             logging.info("Navigating to login page...")
-            await page.goto('https://www.linkedin.com/login')
+            await _goto(page, 'https://www.linkedin.com/login')
             
             await page.wait_for_selector('#username', timeout=5000)
             await page.wait_for_selector('#password', timeout=5000)
             
-            await page.fill('#username', 'anujpatil917@gmail.com')
-            await page.fill('#password', 'Anuj@789@anuj')
+            await page.fill('#username', username)
+            await page.fill('#password', password)
             await page.click('button[type="submit"]')
             
-            await page.wait_for_timeout(5000)
+            try:
+                await page.wait_for_url(lambda u: 'feed' in u or 'mynetwork' in u or 'checkpoint' in u, timeout=15000)
+            except Exception:
+                # Still on the login form (bad credentials), reported below
+                pass
             
             if 'feed' in page.url or 'mynetwork' in page.url:
                 logging.info("Successfully logged in manually")
-                await self.save_cookies(context)
                 return True
             else:
                 logging.error("Login failed")
@@ -255,12 +343,9 @@ async def main():
     
     try:
         scraper = LinkedInScraper()
-        await scraper.scrape_profiles("hr manager coal india limited", max_profiles=20)
+        await scraper.scrape_profiles(["hr manager coal india limited"], max_profiles=20)
     except Exception as e:
         logging.error(f"Fatal error in main: {str(e)}", exc_info=True)
-    finally:
-        loop = asyncio.get_event_loop()
-        await loop.shutdown_asyncgens()
-        
+
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
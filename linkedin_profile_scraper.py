@@ -1,152 +1,165 @@
 import asyncio
 from playwright.async_api import async_playwright
+from browser_pool import block_heavy_resources
+from scraper_utils import setup_logging, write_json_atomic
 import os
 from pathlib import Path
+import io
 import json
 from datetime import datetime
 import logging
 import random
+from urllib.parse import quote_plus
 
-# Enhanced logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-    handlers=[
-        logging.FileHandler("linkedin_scraper.log", mode='a', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging
+setup_logging("linkedin_scraper.log")
 
 # Add a separator in log file for new runs
 logging.info("\n" + "="*50 + "\nNEW SCRAPING SESSION STARTED\n" + "="*50)
 
+# Profile pages open at once on the logged-in context
+MAX_PARALLEL_PROFILES = 4
+
+# Installed on the context so every page defines window.__extractProfile, which reads
+# every section of a profile page in a single call
+_PROFILE_INIT_SCRIPT = '''window.__extractProfile = () => ({
+    name: document.querySelector("h1")?.innerText || "",
+    headline: document.querySelector(".text-body-medium")?.innerText || "",
+    about: document.querySelector(".display-flex.ph5.pv3 .pv-shared-text-with-see-more span")?.innerText || "",
+    experience: Array.from(document.querySelectorAll('#experience-section .pv-entity__position-group')).map(item => {
+        const company = item.querySelector('.pv-entity__company-summary-info h3')?.innerText || '';
+        const title = item.querySelector('.pv-entity__summary-info h3')?.innerText || '';
+        const duration = item.querySelector('.pv-entity__date-range span:nth-child(2)')?.innerText || '';
+        return `- ${title} at ${company} (${duration})`;
+    }),
+    education: Array.from(document.querySelectorAll('#education-section .pv-education-entity')).map(item => {
+        const school = item.querySelector('h3')?.innerText || '';
+        const degree = item.querySelector('.pv-entity__degree-name .pv-entity__comma-item')?.innerText || '';
+        return `- ${degree} from ${school}`;
+    }),
+    skills: Array.from(document.querySelectorAll('.pv-skill-category-entity__name-text')).map(item => item.innerText)
+});'''
+
+# Profile links on a people search results page
+_SEARCH_URLS_JS = '''() => Array.from(document.querySelectorAll('.entity-result__title-text a'))
+    .map(link => link.href)
+    .filter(url => url.includes('/in/'))'''
+
 class LinkedInProfileScraper:
     def __init__(self):
         logging.info("Initializing LinkedIn Profile Scraper...")
         self.user_data_dir = os.path.join(str(Path.home()), ".linkedin_automation")
         self.cookies_file = os.path.join(self.user_data_dir, "cookies.json")
+        self.profile_dir = os.path.join(self.user_data_dir, "chromium_profile")
         self.debug_dir = "debug_output"
         os.makedirs(self.debug_dir, exist_ok=True)
-        logging.info(f"User data directory: {self.user_data_dir}")
-        logging.info(f"Cookies file: {self.cookies_file}")
-        logging.info(f"Debug directory: {self.debug_dir}")
+        logging.info("User data directory: %s", self.user_data_dir)
+        logging.info("Cookies file: %s", self.cookies_file)
+        logging.info("Debug directory: %s", self.debug_dir)
 
     async def extract_profile_markdown(self, page, profile_url):
         """Extract detailed profile information and return as markdown."""
         try:
-            logging.info(f"Starting extraction for profile: {profile_url}")
-            await page.goto(profile_url)
+            logging.info("Starting extraction for profile: %s", profile_url)
+            await page.goto(profile_url, wait_until='domcontentloaded')
             logging.info("Waiting for profile page to load...")
-            await page.wait_for_timeout(3000)
+            await page.wait_for_selector('h1, .text-body-medium', state='visible', timeout=15000)
             
-            markdown = []
+            # Read every section in one browser round-trip instead of one per field
+            logging.info("Extracting profile sections...")
+            data = await page.evaluate('() => window.__extractProfile()')
+            name = data['name'] or "Not Found"
+            headline = data['headline'] or "Not Found"
+            logging.info("Found profile: %s - %s", name, headline)
             
-            # Extract basic info
-            logging.info("Extracting basic information...")
-            name = await page.evaluate('() => document.querySelector("h1")?.innerText || "Not Found"')
-            headline = await page.evaluate('() => document.querySelector(".text-body-medium")?.innerText || "Not Found"')
-            logging.info(f"Found profile: {name} - {headline}")
-            
-            markdown.append(f"# {name}")
-            markdown.append(f"## {headline}\n")
+            # Write straight into one buffer rather than collecting lines to join
+            markdown = io.StringIO()
+            markdown.write(f"# {name}\n## {headline}\n\n")
             
             # About section
-            logging.info("Extracting about section...")
-            about = await page.evaluate('() => document.querySelector(".display-flex.ph5.pv3 .pv-shared-text-with-see-more span")?.innerText || ""')
+            about = data['about']
             if about:
                 logging.info("About section found")
-                markdown.append("## About")
-                markdown.append(about + "\n")
+                markdown.write(f"## About\n{about}\n\n")
             else:
                 logging.info("No about section found")
             
             # Experience
-            logging.info("Extracting experience section...")
-            exp_items = await page.evaluate('''
-                () => {
-                    const items = document.querySelectorAll('#experience-section .pv-entity__position-group');
-                    return Array.from(items).map(item => {
-                        const company = item.querySelector('.pv-entity__company-summary-info h3')?.innerText || '';
-                        const title = item.querySelector('.pv-entity__summary-info h3')?.innerText || '';
-                        const duration = item.querySelector('.pv-entity__date-range span:nth-child(2)')?.innerText || '';
-                        return `- ${title} at ${company} (${duration})`;
-                    });
-                }
-            ''')
-            
-            if exp_items and len(exp_items) > 0:
-                logging.info(f"Found {len(exp_items)} experience items")
-                markdown.append("## Experience")
-                markdown.extend(exp_items)
-                markdown.append("")
+            exp_items = data['experience']
+            if exp_items:
+                logging.info("Found %d experience items", len(exp_items))
+                markdown.write("## Experience\n")
+                markdown.writelines(f"{item}\n" for item in exp_items)
+                markdown.write("\n")
             else:
                 logging.info("No experience items found")
             
             # Education
-            logging.info("Extracting education section...")
-            edu_items = await page.evaluate('''
-                () => {
-                    const items = document.querySelectorAll('#education-section .pv-education-entity');
-                    return Array.from(items).map(item => {
-                        const school = item.querySelector('h3')?.innerText || '';
-                        const degree = item.querySelector('.pv-entity__degree-name .pv-entity__comma-item')?.innerText || '';
-                        return `- ${degree} from ${school}`;
-                    });
-                }
-            ''')
-            
-            if edu_items and len(edu_items) > 0:
-                logging.info(f"Found {len(edu_items)} education items")
-                markdown.append("## Education")
-                markdown.extend(edu_items)
-                markdown.append("")
+            edu_items = data['education']
+            if edu_items:
+                logging.info("Found %d education items", len(edu_items))
+                markdown.write("## Education\n")
+                markdown.writelines(f"{item}\n" for item in edu_items)
+                markdown.write("\n")
             else:
                 logging.info("No education items found")
             
             # Skills
-            logging.info("Extracting skills section...")
-            skills = await page.evaluate('''
-                () => {
-                    const items = document.querySelectorAll('.pv-skill-category-entity__name-text');
-                    return Array.from(items).map(item => item.innerText);
-                }
-            ''')
-            
-            if skills and len(skills) > 0:
-                logging.info(f"Found {len(skills)} skills")
-                markdown.append("## Skills")
-                markdown.extend([f"- {skill}" for skill in skills])
-                markdown.append("")
+            skills = data['skills']
+            if skills:
+                logging.info("Found %d skills", len(skills))
+                markdown.write("## Skills\n")
+                markdown.writelines(f"- {skill}\n" for skill in skills)
+                markdown.write("\n")
             else:
                 logging.info("No skills found")
             
             # Contact info
             logging.info("Adding contact information...")
-            markdown.append("## Contact")
-            markdown.append(f"- LinkedIn: {profile_url}")
+            markdown.write(f"## Contact\n- LinkedIn: {profile_url}")
             
-            logging.info(f"Successfully extracted profile data for: {name}")
-            return "\n".join(markdown)
+            logging.info("Successfully extracted profile data for: %s", name)
+            return markdown.getvalue()
             
         except Exception as e:
-            logging.error(f"Error extracting profile info: {str(e)}", exc_info=True)
+            logging.error("Error extracting profile info: %s", e, exc_info=True)
             return f"Error extracting profile: {str(e)}"
 
+    @staticmethod
+    def _read_json(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+
     async def perform_login(self, page):
         """Handle login process with cookie support."""
         logging.info("Starting login process...")
         
-        if os.path.exists(self.cookies_file):
+        # The persistent profile is the cookie jar; cookies.json only seeds a fresh profile
+        cookies = await page.context.cookies('https://www.linkedin.com')
+        has_session = any(c['name'] == 'li_at' for c in cookies)
+        if has_session:
+            logging.info("Found LinkedIn session in browser profile")
+        elif os.path.exists(self.cookies_file):
             logging.info("Found existing cookies file, attempting to use saved cookies...")
             try:
-                with open(self.cookies_file, 'r') as f:
-                    cookies = json.load(f)
-                logging.info(f"Loaded {len(cookies)} cookies from file")
+                cookies = await asyncio.to_thread(self._read_json, self.cookies_file)
+                logging.info("Loaded %d cookies from file", len(cookies))
                 await page.context.add_cookies(cookies)
-                
+                has_session = True
+            except Exception as e:
+                logging.error("Error loading cookies file: %s", e, exc_info=True)
+        
+        if has_session:
+            try:
                 logging.info("Navigating to LinkedIn feed...")
-                await page.goto('https://www.linkedin.com/feed/')
-                await page.wait_for_timeout(5000)
+                await page.goto('https://www.linkedin.com/feed/', wait_until='domcontentloaded')
+                try:
+                    # Resolves as soon as LinkedIn settles on the feed or bounces a stale
+                    # session to the login page or auth wall
+                    await page.wait_for_url(lambda u: '/feed/' in u or 'login' in u or 'authwall' in u, timeout=10000)
+                except Exception:
+                    # Neither showed up in time, handled below
+                    pass
                 
                 if 'feed' in page.url:
                     logging.info("Successfully logged in using cookies!")
@@ -155,21 +168,31 @@ class LinkedInProfileScraper:
                     logging.warning("Cookie login failed - not on feed page")
                 
             except Exception as e:
-                logging.error(f"Error during cookie login: {str(e)}", exc_info=True)
+                logging.error("Error during cookie login: %s", e, exc_info=True)
                 
+        username = os.environ.get('LI_USER')
+        password = os.environ.get('LI_PASS')
+        if not username or not password:
+            logging.error("LI_USER and LI_PASS must be set to log in")
+            return False
+        
         logging.info("Proceeding with manual login...")
         try:
             logging.info("Navigating to login page...")
-            await page.goto('https://www.linkedin.com/login')
-            await page.wait_for_timeout(3000)
+            await page.goto('https://www.linkedin.com/login', wait_until='domcontentloaded')
+            await page.wait_for_selector('#username', timeout=10000)
             
             logging.info("Filling login form...")
-            await page.fill('#username', 'anujpatil917@gmail.com')
-            await page.fill('#password', 'Anuj@789@anuj')
+            await page.fill('#username', username)
+            await page.fill('#password', password)
             
             logging.info("Submitting login form...")
             await page.click('button[type="submit"]')
-            await page.wait_for_timeout(5000)
+            try:
+                await page.wait_for_url(lambda u: 'feed' in u or 'checkpoint' in u, timeout=15000)
+            except Exception:
+                # Still on the login form (bad credentials), reported below
+                pass
             
             if 'feed' in page.url:
                 logging.info("Successfully logged in manually!")
@@ -177,98 +200,112 @@ class LinkedInProfileScraper:
                 logging.info("Saving cookies for future use...")
                 cookies = await page.context.cookies()
                 os.makedirs(self.user_data_dir, exist_ok=True)
-                with open(self.cookies_file, 'w') as f:
-                    json.dump(cookies, f)
-                logging.info(f"Saved {len(cookies)} cookies to file")
+                await asyncio.to_thread(write_json_atomic, self.cookies_file, cookies)
+                logging.info("Saved %d cookies to file", len(cookies))
                 return True
             else:
                 logging.warning("Manual login failed - not on feed page")
                 
         except Exception as e:
-            logging.error(f"Login failed: {str(e)}", exc_info=True)
+            logging.error("Login failed: %s", e, exc_info=True)
             
         return False
 
     async def perform_search(self, page, search_query):
         """Perform search and return results."""
         try:
-            logging.info(f"Starting search for query: '{search_query}'")
-            encoded_query = search_query.replace(' ', '%20')
-            search_url = f'https://www.linkedin.com/search/results/people/?keywords={encoded_query}'
+            logging.info("Starting search for query: '%s'", search_query)
+            search_url = f'https://www.linkedin.com/search/results/people/?keywords={quote_plus(search_query)}'
             
-            logging.info(f"Navigating to search URL: {search_url}")
-            await page.goto(search_url)
+            logging.info("Navigating to search URL: %s", search_url)
+            await page.goto(search_url, wait_until='domcontentloaded')
             logging.info("Waiting for search results to load...")
-            await page.wait_for_timeout(5000)
+            await page.wait_for_selector('.entity-result__title-text a', timeout=15000)
             
             logging.info("Extracting profile URLs from search results...")
-            profile_urls = await page.evaluate('''
-                () => {
-                    const links = document.querySelectorAll('.entity-result__title-text a');
-                    return Array.from(links).map(link => link.href).filter(url => url.includes('/in/'));
-                }
-            ''')
+            profile_urls = await page.evaluate(_SEARCH_URLS_JS)
+            # Result cards often link the same profile twice; strip tracking params and
+            # keep each profile once, in result order
+            profile_urls = list(dict.fromkeys(url.split('?')[0].rstrip('/') for url in profile_urls))
             
-            logging.info(f"Found {len(profile_urls)} profile URLs")
+            logging.info("Found %d profile URLs", len(profile_urls))
             return profile_urls
             
         except Exception as e:
-            logging.error(f"Error performing search: {str(e)}", exc_info=True)
+            logging.error("Error performing search: %s", e, exc_info=True)
             return []
 
-    async def scrape_profiles(self, search_query, max_pages=3):
-        logging.info(f"Starting profile scraping for query: '{search_query}' (max pages: {max_pages})")
+    async def scrape_profile(self, context, sem, profile_url):
+        """Extract one profile on its own page, bounded by the shared semaphore."""
+        async with sem:
+            # Polite random pause before each visit, so the pages don't load in lockstep
+            delay = random.uniform(3.0, 5.0)
+            logging.info("Waiting %.1fs before visiting %s", delay, profile_url)
+            await asyncio.sleep(delay)
+            page = await context.new_page()
+            try:
+                return await self.extract_profile_markdown(page, profile_url)
+            finally:
+                await page.close()
+
+    async def scrape_profiles(self, search_query, max_pages=3, max_parallel=MAX_PARALLEL_PROFILES):
+        logging.info("Starting profile scraping for query: '%s' (max pages: %d)", search_query, max_pages)
         start_time = datetime.now()
         
         try:
             async with async_playwright() as p:
-                logging.info("Launching browser...")
-                browser = await p.chromium.launch(
+                # A persistent profile keeps cookies and caches on disk between runs
+                logging.info("Launching browser with persistent profile...")
+                context = await p.chromium.launch_persistent_context(
+                    self.profile_dir,
                     headless=False,
-                    args=['--disable-blink-features=AutomationControlled']
-                )
-                logging.info("Creating browser context...")
-                context = await browser.new_context(
+                    # 100 MB disk cache so LinkedIn's script bundles are reused across profiles and runs
+                    args=['--disable-blink-features=AutomationControlled', '--disk-cache-size=104857600'],
                     viewport={'width': 1920, 'height': 1080},
                     user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/121.0.0.0 Safari/537.36'
                 )
-                page = await context.new_page()
+                # Profile pages are mostly images and fonts the extraction never reads
+                await block_heavy_resources(context)
+                # Every navigation waits on the element it needs afterwards, so don't
+                # wait for the load event (trackers, analytics) and give up sooner
+                context.set_default_navigation_timeout(20000)
+                # Compile the extraction function once per page instead of shipping it per profile
+                await context.add_init_script(_PROFILE_INIT_SCRIPT)
+                page = context.pages[0] if context.pages else await context.new_page()
                 
                 if not await self.perform_login(page):
                     logging.error("Login failed, aborting scraping")
-                    await browser.close()
+                    await context.close()
                     return
                 
                 profile_urls = await self.perform_search(page, search_query)
                 if not profile_urls:
                     logging.error("No profiles found, aborting scraping")
-                    await browser.close()
+                    await context.close()
                     return
                 
-                logging.info(f"Starting to process {len(profile_urls)} profiles...")
+                logging.info("Starting to process %d profiles...", len(profile_urls))
+                
+                # Profiles load concurrently on pages of the same logged-in context
+                sem = asyncio.Semaphore(max_parallel)
+                results = await asyncio.gather(*(self.scrape_profile(context, sem, url) for url in profile_urls))
                 
-                # Extract and print markdown for each profile
-                for i, profile_url in enumerate(profile_urls, 1):
-                    logging.info(f"Processing profile {i}/{len(profile_urls)}: {profile_url}")
-                    markdown = await self.extract_profile_markdown(page, profile_url)
+                # Print markdown for each profile in search order
+                for i, markdown in enumerate(results, 1):
                     print(f"\nProfile {i}/{len(profile_urls)}:\n")
                     print(markdown)
                     print("\n" + "="*80 + "\n")
-                    
-                    delay = random.randint(3000, 5000)
-                    logging.info(f"Waiting {delay}ms before next profile...")
-                    await page.wait_for_timeout(delay)
                 
                 logging.info("Closing browser...")
-                await browser.close()
+                await context.close()
                 
                 end_time = datetime.now()
                 duration = end_time - start_time
-                logging.info(f"Scraping completed in {duration.total_seconds():.2f} seconds")
-                logging.info(f"Successfully processed {len(profile_urls)} profiles")
+                logging.info("Scraping completed in %.2f seconds", duration.total_seconds())
+                logging.info("Successfully processed %d profiles", len(profile_urls))
                 
         except Exception as e:
-            logging.error(f"Unexpected error during scraping: {str(e)}", exc_info=True)
+            logging.error("Unexpected error during scraping: %s", e, exc_info=True)
 
 async def main():
     logging.info("Starting LinkedIn Profile Scraper...")
@@ -276,7 +313,7 @@ async def main():
         scraper = LinkedInProfileScraper()
         await scraper.scrape_profiles("Sachin Raj", max_pages=3)
     except Exception as e:
-        logging.error(f"Fatal error in main: {str(e)}", exc_info=True)
+        logging.error("Fatal error in main: %s", e, exc_info=True)
     finally:
         logging.info("LinkedIn Profile Scraper finished")
 
@@ -0,0 +1,52 @@
+import atexit
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+
+# Listener started by the first setup_logging call in this process
+_listener = None
+
+def setup_logging(log_file, level=logging.INFO):
+    """Route the root logger through a queue so file and console writes happen on a
+    listener thread instead of blocking the event loop.
+
+    Like logging.basicConfig, only the first call configures anything; later calls
+    (e.g. from a second scraper module imported into the same process) return the
+    listener that is already running.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        logging.FileHandler(log_file, mode='a', encoding='utf-8'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # The QueueHandler keeps the default '%(message)s' formatter; the listener's
+    # handlers add the timestamp and level, so records are only decorated once
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers)
+    _listener.start()
+    # Flush whatever is still queued when the interpreter exits
+    atexit.register(_listener.stop)
+    return _listener
+
+def write_json_atomic(path, data):
+    """Dump data as JSON to path without ever leaving a half-written file behind."""
+    # Write to a temp file and swap it in, so a crash mid-write can't corrupt the file
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
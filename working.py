@@ -1,97 +1,52 @@
 import asyncio
 from crawl4ai import *
-import re
-from dataclasses import dataclass
-from typing import List
+from itertools import chain
+from bing_results import LinkedInProfile, NoMarkdownGenerator, extract_profiles_from_html
 
-@dataclass
-class LinkedInProfile:
-    name: str
-    designation: str
-    url: str
-    description: str = ""
-    connections: str = "Not specified"
-
-def extract_linkedin_profiles(markdown_content: str) -> List[LinkedInProfile]:
-    profiles = []
-    
-    # Pattern to match LinkedIn profile sections
-    profile_pattern = r'\[([^\]]+)\]\(https://www\.bing\.com/<(https:/[^>]+)>\)\n## \[([^\]]+)\]'
-    matches = re.finditer(profile_pattern, markdown_content)
-    
-    for match in matches:
-        if 'linkedin.com/in/' not in match.group(2):
-            continue
-            
-        # Clean up the URL (remove bing redirect)
-        url = match.group(2).replace('https://', 'https://')
-        
-        # Extract name and designation
-        title_parts = match.group(3).split(' - ')
-        name = title_parts[0].strip('*')
-        designation = 'HR at Amazon'  # Default
-        if len(title_parts) > 1:
-            designation = title_parts[1].strip('*')
-            
-        # Find description in the following lines
-        description = ""
-        desc_start = markdown_content.find(match.group(0)) + len(match.group(0))
-        next_section = markdown_content.find('[', desc_start)
-        if next_section != -1:
-            description = markdown_content[desc_start:next_section].strip()
-        
-        # Extract connections if available
-        connections = "Not specified"
-        if "connections" in description:
-            conn_match = re.search(r'(\d+)\+?\s*connections', description)
-            if conn_match:
-                connections = f"{conn_match.group(1)}+"
-        
-        profile = LinkedInProfile(
-            name=name,
-            designation=designation,
-            url=url,
-            description=description,
-            connections=connections
-        )
-        profiles.append(profile)
-    
-    return profiles
+# Bing pages fetched at once
+MAX_PARALLEL_FETCHES = 4
 
 async def main():
     async with AsyncWebCrawler() as crawler:
-        # List of pages to crawl (1-3)
-        pages = [1, 11, 21]  # First three pages
-        all_profiles = []
+        # Result pages 1-3 for each company search
+        queries = ["hr+amazon", "hr+google", "hr+microsoft", "hr+apple"]
+        all_urls = [f"https://www.bing.com/search?q={query}+linkedin&first={start_index}"
+                    for start_index in [1, 11, 21] for query in queries]
+        
+        # Fetch every page in one batch on the crawler's shared browser, a few at a time
+        # and with a randomised 0.5-1.5s delay between requests to stay polite to Bing
+        results = await crawler.arun_many(
+            urls=all_urls,
+            config=CrawlerRunConfig(
+                cache_mode=CacheMode.ENABLED,
+                # Profiles are parsed straight from the HTML, so skip the markdown pass
+                markdown_generator=NoMarkdownGenerator(),
+                semaphore_count=MAX_PARALLEL_FETCHES,
+                mean_delay=0.5,
+                max_range=1.0
+            )
+        )
         
-        for start_index in pages:
-            urls = [f"https://www.bing.com/search?q=hr+amazon+linkedin&first={start_index}",
-                    f"https://www.bing.com/search?q=hr+google+linkedin&first={start_index}",
-                    f"https://www.bing.com/search?q=hr+microsoft+linkedin&first={start_index}",
-                    f"https://www.bing.com/search?q=hr+apple+linkedin&first={start_index}"]
-            for url in urls:
-                result = await crawler.arun(url=url)
-                
-            # Extract profiles from this page
-                profiles = extract_linkedin_profiles(result.markdown)
-                all_profiles.extend(profiles)
-            
-            # Wait a bit between requests to be polite
-                await asyncio.sleep(2)
+        # Extract profiles from every page's HTML with lxml.
+        # Bing repeats profiles across queries and pages, so keep the first per URL
+        seen: dict[str, LinkedInProfile] = {}
+        for profile in chain.from_iterable(extract_profiles_from_html(result.html) for result in results if result.success):
+            seen.setdefault(profile.url.split('?')[0].rstrip('/'), profile)
+        all_profiles = list(seen.values())
         
         # Print the results in a formatted way
-            print("\n=== LinkedIn Profiles Found ===\n")
-            for i, profile in enumerate(all_profiles, 1):
-                print(f"Profile {i}:")
-                print(f"Name: {profile.name}")
-                print(f"Designation: {profile.designation}")
-                print(f"LinkedIn URL: {profile.url}")
-                print(f"Connections: {profile.connections}")
-                if profile.description:
-                    print(f"Description: {profile.description.strip()}")
-                print("-" * 50)
-            
-            print(f"\nTotal profiles found: {len(all_profiles)}")
+        print("\n=== LinkedIn Profiles Found ===\n")
+        for i, profile in enumerate(all_profiles, 1):
+            print(f"Profile {i}:")
+            print(f"Name: {profile.name}")
+            print(f"Designation: {profile.designation}")
+            print(f"LinkedIn URL: {profile.url}")
+            print(f"Connections: {profile.connections}")
+            if profile.description:
+                print(f"Description: {profile.description.strip()}")
+            print("-" * 50)
+        
+        print(f"\nTotal profiles found: {len(all_profiles)}")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file